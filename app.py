@@ -113,8 +113,11 @@ margin = 80
 #     image.save(f"Gyan_Dariyo_image_{idx+1}.png")
 from PIL import Image, ImageDraw, ImageFont
 import textwrap
-from gtts import gTTS
 import os
+from csv_to_video_generator.tts import get_backend, synthesize_speech
+
+# TTS_BACKEND=offline or stub renders without network access
+tts_backend = get_backend(os.environ.get("TTS_BACKEND", "gtts"))
 
 # data_list = [
 #     ["કલકત્તામાં એશિયાટિક સોસાયટીની સ્થાપના સમયે બંગાળના ગવર્નર જનરલ કોણ હતા ?", "A. કોનૅવોલીસ", "B. વિલિયમ બેન્ટિક", "C. વોરન હેસ્ટીંગ્સ", "D. વેલેસ્લી", "જવાબ :- વોરન હેસ્ટીંગ્સ", ""],
@@ -153,12 +156,10 @@ for idx, data in enumerate(data_list):
     image.show()
 
     # Convert text to speech and create an audio file
-    tts = gTTS(text=text_to_speak, lang='gu')
-    audio_file_path = f"Gyan_Dariyo_audio_{idx+1}.mp3"
-    tts.save(audio_file_path)
+    audio_file_path = f"Gyan_Dariyo_audio_{idx+1}{tts_backend.extension}"
+    synthesize_speech(text_to_speak, audio_file_path, tts_backend, lang='gu')
 
 from moviepy.editor import ImageClip, AudioFileClip
-from gtts import gTTS
 import textwrap
 video_list = []
 default_fps = 24  # Default frames per second for the video clips
@@ -167,9 +168,8 @@ for idx, data in enumerate(data_list):
     text_to_speak = "\n".join(data)
 
     # Convert text to speech and create an audio file
-    tts = gTTS(text=text_to_speak, lang='gu')
-    audio_file_path = f"Gyan_Dariyo_audio_{idx+1}.mp3"
-    tts.save(audio_file_path)
+    audio_file_path = f"Gyan_Dariyo_audio_{idx+1}{tts_backend.extension}"
+    synthesize_speech(text_to_speak, audio_file_path, tts_backend, lang='gu')
 
     # Load the audio clip
     audio_clip = AudioFileClip(audio_file_path)
@@ -198,17 +198,15 @@ for idx, data in enumerate(data_list):
     # Print a message to indicate completion
     print(f"Video {idx+1} created: {video_file_path}")
 import time
-from gtts import gTTS
 
 def create_combined_mp3(data_list, output_file):
     combined_text = " ".join(data_list)
-    tts = gTTS(text=combined_text, lang='gu')
-    tts.save(output_file)
+    synthesize_speech(combined_text, output_file, tts_backend, lang='gu')
     time.sleep(10)
     print(f"Created combined MP3: {output_file}")
 
 for i in range(len(data_list)):
-    output_file = f"combined_output_{i+1}.mp3"
+    output_file = f"combined_output_{i+1}{tts_backend.extension}"
     create_combined_mp3([str(data_list[i])], output_file)
 from moviepy.editor import VideoFileClip, concatenate_videoclips
 
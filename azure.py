@@ -707,8 +707,24 @@ print(data_list)
 
 from PIL import Image, ImageDraw, ImageFont
 import textwrap
-from gtts import gTTS
 import os
+from csv_to_video_generator.tts import get_backend
+from csv_to_video_generator.tts_cache import TTSCache
+from csv_to_video_generator.tts_scheduler import AsyncTTSScheduler
+
+tts_cache = TTSCache()
+# TTS_BACKEND=offline or stub renders without network access
+tts_backend = get_backend(os.environ.get("TTS_BACKEND", "gtts"))
+# One gTTS request every 50 seconds, retried with backoff on 429/5xx;
+# cache hits are not throttled
+tts_scheduler = AsyncTTSScheduler(tts_backend, tts_cache, lang='en',
+                                  rate=1 / 50 if tts_backend.engine == "gtts" else None)
+
+def speak_all(jobs):
+    # One scheduler run (one event loop) for all (text, audio_file_path) jobs
+    for result in tts_scheduler.run(jobs):
+        if isinstance(result, BaseException):
+            raise result
 
 image_width = 1920
 image_height = 1080
@@ -718,6 +734,7 @@ font_size = 80
 line_spacing = 6
 margin = 70
 
+speech_jobs = []
 for idx, data in enumerate(data_list):
     image = Image.new("RGB", (image_width, image_height), background_color)
     draw = ImageDraw.Draw(image)
@@ -739,28 +756,22 @@ for idx, data in enumerate(data_list):
 
     image.save(f"Gyan_Dariyo_image_{idx+1}.png")
     image.show()
-    import time
-    time.sleep(50)
     # Convert text to speech and create an audio file
-    tts = gTTS(text=text_to_speak, lang='en')
-    audio_file_path = f"Gyan_Dariyo_audio_{idx+1}.mp3"
-    tts.save(audio_file_path)
+    audio_file_path = f"Gyan_Dariyo_audio_{idx+1}{tts_backend.extension}"
+    speech_jobs.append((text_to_speak, audio_file_path))
+speak_all(speech_jobs)
 
 from moviepy.editor import ImageClip, AudioFileClip
-from gtts import gTTS
 import textwrap
 video_list = []
 default_fps = 24  # Default frames per second for the video clips
 
-for idx, data in enumerate(data_list):
-    text_to_speak = "\n".join(data)
-    import time
-    time.sleep(50)
+# Convert text to speech and create an audio file for every row
+speak_all([("\n".join(data), f"Gyan_Dariyo_audio_{idx+1}{tts_backend.extension}")
+           for idx, data in enumerate(data_list)])
 
-    # Convert text to speech and create an audio file
-    tts = gTTS(text=text_to_speak, lang='en')
-    audio_file_path = f"Gyan_Dariyo_audio_{idx+1}.mp3"
-    tts.save(audio_file_path)
+for idx in range(len(data_list)):
+    audio_file_path = f"Gyan_Dariyo_audio_{idx+1}{tts_backend.extension}"
 
     # Load the audio clip
     audio_clip = AudioFileClip(audio_file_path)
@@ -788,20 +799,13 @@ for idx, data in enumerate(data_list):
 
     # Print a message to indicate completion
     print(f"Video {idx+1} created: {video_file_path}")
-import time
-from gtts import gTTS
-
-def create_combined_mp3(data_list, output_file):
-    combined_text = " ".join(data_list)
-    import time
-    time.sleep(50)
-    tts = gTTS(text=combined_text, lang='en')
-    tts.save(output_file)
-    print(f"Created combined MP3: {output_file}")
-
-for i in range(len(data_list)):
-    output_file = f"combined_output_{i+1}.mp3"
-    create_combined_mp3([str(data_list[i])], output_file)
+combined_jobs = [(str(data_list[i]), f"combined_output_{i+1}{tts_backend.extension}")
+                 for i in range(len(data_list))]
+for (_, output_file), result in zip(combined_jobs, tts_scheduler.run(combined_jobs), strict=True):
+    if isinstance(result, BaseException):
+        print(f"Failed to create {output_file}: {result}")
+    else:
+        print(f"Created combined MP3: {output_file}")
 from moviepy.editor import VideoFileClip, concatenate_videoclips
 
 video_list = []
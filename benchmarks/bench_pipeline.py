@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmarks for the render, TTS and encode stages.
+
+Builds synthetic question banks (Latin and Gujarati text) of the requested
+sizes and times GyanDariyoVideoCreator.iter_frames / create_videos /
+create_final_video and VideoGenerator.create_frame. Speech comes from the
+deterministic StubBackend, so runs need no network. The encode benchmarks are
+skipped above --encode-max-rows. Results are written as JSON so runs on
+different commits can be compared:
+
+    python benchmarks/bench_pipeline.py --sizes 10 100 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from csv_to_video_generator.tts import StubBackend  # noqa: E402
+from csv_to_video_generator.video_creator import GyanDariyoVideoCreator  # noqa: E402
+
+BENCHMARKS = ("render_frames", "create_videos", "create_final_video", "create_frame")
+ENCODE_BENCHMARKS = ("create_videos", "create_final_video")
+SCRIPTS = ("latin", "gujarati")
+
+LATIN_WORDS = ("artificial", "intelligence", "machine", "learning", "network", "model", "data",
+               "training", "language", "vision", "system", "python", "answer", "question",
+               "decision", "process", "learning")
+GUJARATI_WORDS = ("કલકત્તામાં", "એશિયાટિક", "સોસાયટીની", "સ્થાપના", "સમયે", "બંગાળના", "ગવર્નર",
+                  "જનરલ", "કોણ", "હતા", "સ્વામી", "વિવેકાનંદ", "નું", "મૂળ", "નામ", "શું", "હતું",
+                  "સુરેન્દ્રનાથ", "રવીન્દ્રનાથ", "રામકૃષ્ણ", "નરેન્દ્રનાથ")
+
+
+def make_bank(n_rows, script="latin", seed=0):
+    """Deterministic question bank in the row format GyanDariyoVideoCreator expects."""
+    rng = random.Random(f"{script}-{seed}")
+    words = LATIN_WORDS if script == "latin" else GUJARATI_WORDS
+
+    def phrase(low, high):
+        return " ".join(rng.choice(words) for _ in range(rng.randint(low, high)))
+
+    bank = []
+    for _ in range(n_rows):
+        options = [phrase(1, 4) for _ in range(4)]
+        bank.append([
+            phrase(6, 16) + " ?",
+            f"A. {options[0]}",
+            f"B. {options[1]}",
+            f"C. {options[2]}",
+            f"D. {options[3]}",
+            f"Answer: {rng.choice(options)}",
+            phrase(0, 12),
+        ])
+    return bank
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def render_all(creator):
+    for _ in creator.iter_frames():
+        pass
+
+
+def bench_creator(bank, benchmarks, workers, glyph_atlas=False, seconds_per_char=0.01):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_") as work_dir:
+        creator = GyanDariyoVideoCreator(
+            bank, workers=workers, tts_cache=False,
+            tts_backend=StubBackend(seconds_per_char=seconds_per_char),
+            work_dir=work_dir, glyph_atlas=glyph_atlas,
+            output_path=os.path.join(work_dir, "final.mp4"))
+
+        if "render_frames" in benchmarks:
+            # Slides rendered in memory, as the encoders get them; no PNG encoding.
+            results["render_frames"], _ = timed(render_all, creator)
+
+        video_list = None
+        if "create_videos" in benchmarks or "create_final_video" in benchmarks:
+            seconds, video_list = timed(creator.create_videos)
+            if "create_videos" in benchmarks:
+                results["create_videos"] = seconds
+
+        if "create_final_video" in benchmarks and video_list:
+            results["create_final_video"], _ = timed(creator.create_final_video, video_list)
+    return results
+
+
+def bench_create_frame(bank, glyph_atlas=False):
+    # newvideo.py lives at the repository root next to the package.
+    from newvideo import AudioConfig, VideoConfig, VideoGenerator
+
+    generator = VideoGenerator(VideoConfig(glyph_atlas=glyph_atlas), AudioConfig(), tts_backend=StubBackend())
+    try:
+        start = time.perf_counter()
+        for data in bank:
+            generator.create_frame(data[0], data[1:5], data[5].removeprefix("Answer: "), data[6],
+                                   show_answer=True)
+        return time.perf_counter() - start
+    finally:
+        generator.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CSV to video pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100],
+                        help="Question bank sizes to benchmark (default: 10 100)")
+    parser.add_argument("--scripts", nargs="+", choices=SCRIPTS, default=list(SCRIPTS),
+                        help="Text scripts of the synthetic banks (default: latin gujarati)")
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS),
+                        help="Benchmarks to run (default: all)")
+    parser.add_argument("--workers", type=int, default=1, help="Workers passed to create_videos")
+    parser.add_argument("--glyph-atlas", action="store_true",
+                        help="Render text through the glyph atlas instead of ImageDraw.text")
+    parser.add_argument("--seconds-per-char", type=float, default=0.01,
+                        help="Length of the stub speech per character of text (default: 0.01)")
+    parser.add_argument("--encode-max-rows", type=int, default=1000,
+                        help="Skip create_videos and create_final_video for larger banks (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic banks")
+    parser.add_argument("--output", help="Write results as JSON to this file (default: stdout)")
+    args = parser.parse_args()
+
+    results = []
+    for script in args.scripts:
+        for size in args.sizes:
+            bank = make_bank(size, script, args.seed)
+            benchmarks = args.benchmarks
+            if size > args.encode_max_rows:
+                benchmarks = [name for name in benchmarks if name not in ENCODE_BENCHMARKS]
+            timings = bench_creator(bank, benchmarks, args.workers, args.glyph_atlas,
+                                    args.seconds_per_char)
+            if "create_frame" in args.benchmarks:
+                timings["create_frame"] = bench_create_frame(bank, args.glyph_atlas)
+
+            for name, seconds in timings.items():
+                results.append({
+                    "benchmark": name,
+                    "script": script,
+                    "rows": size,
+                    "seconds": seconds,
+                    "seconds_per_row": seconds / size,
+                })
+                print(f"{name:<20} {script:<9} {size:>6} rows  {seconds:9.3f}s  "
+                      f"{seconds / size * 1000:9.2f} ms/row", file=sys.stderr)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "workers": args.workers,
+        "glyph_atlas": args.glyph_atlas,
+        "seconds_per_char": args.seconds_per_char,
+        "encode_max_rows": args.encode_max_rows,
+        "seed": args.seed,
+        "results": results,
+    }
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
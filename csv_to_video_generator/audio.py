@@ -0,0 +1,116 @@
+"""Assembly of per-segment speech into one pre-mixed PCM track."""
+import math
+import wave
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .ffmpeg_tools import decode_pcm
+
+
+def read_wav_pcm(path: str, sample_rate: int = 44100, channels: int = 2) -> Optional[np.ndarray]:
+    """Read a 16-bit PCM WAV in-process, shape ``(samples, channels)``; None if it isn't one.
+
+    Mono and stereo are converted to ``channels`` and other rates are
+    resampled linearly, so speech from the stub and offline backends needs
+    no ffmpeg process.
+    """
+    try:
+        with wave.open(str(path), "rb") as wav:
+            if wav.getsampwidth() != 2 or wav.getnchannels() not in (1, 2):
+                return None
+            rate, source_channels = wav.getframerate(), wav.getnchannels()
+            pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2").reshape(-1, source_channels)
+    except (wave.Error, EOFError):
+        return None
+
+    if source_channels != channels:
+        if channels == 1:
+            pcm = pcm.mean(axis=1, keepdims=True)
+        elif source_channels == 1:
+            # Same level as ffmpeg's upmix, which puts mono in the centre at -3 dB.
+            pcm = np.repeat(pcm * np.sqrt(0.5), channels, axis=1)
+        else:
+            return None
+    if rate != sample_rate and len(pcm):
+        samples = round(len(pcm) * sample_rate / rate)
+        positions = np.arange(samples) * (rate / sample_rate)
+        pcm = np.column_stack([np.interp(positions, np.arange(len(pcm)), pcm[:, channel])
+                               for channel in range(channels)])
+    if pcm.dtype.kind == "f":
+        pcm = np.rint(pcm).astype("<i2")
+    return pcm
+
+
+def load_pcm(path: str, sample_rate: int = 44100, channels: int = 2) -> np.ndarray:
+    """Signed 16-bit PCM of ``path``: read directly if it is a PCM WAV, else decoded by ffmpeg."""
+    pcm = read_wav_pcm(path, sample_rate, channels)
+    return decode_pcm(path, sample_rate, channels) if pcm is None else pcm
+
+
+class AudioTrack:
+    """Speech clips laid out on one timeline at sample-accurate offsets.
+
+    Each file is decoded once with :func:`load_pcm`; gaps between clips are
+    silence and overlapping clips are mixed. The result is written as a
+    single WAV so the encoder reads one track instead of resampling every
+    segment again.
+    """
+
+    def __init__(self, sample_rate: int = 44100, channels: int = 2):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._clips: List[Tuple[int, np.ndarray]] = []
+
+    def decode(self, path: str) -> np.ndarray:
+        return load_pcm(path, self.sample_rate, self.channels)
+
+    def place(self, pcm: np.ndarray, start: float):
+        """Mix ``pcm`` in starting at ``start`` seconds (rounded to the nearest sample)."""
+        self._clips.append((round(start * self.sample_rate), pcm))
+
+    @property
+    def samples(self) -> int:
+        return max((offset + len(pcm) for offset, pcm in self._clips), default=0)
+
+    @property
+    def duration(self) -> float:
+        return self.samples / self.sample_rate
+
+    def to_array(self, duration: Optional[float] = None) -> np.ndarray:
+        """The mixed track, padded with silence or cut to ``duration`` seconds if given."""
+        samples = self.samples if duration is None else math.ceil(duration * self.sample_rate)
+        mix = np.zeros((samples, self.channels), dtype=np.int32)
+        for offset, pcm in self._clips:
+            end = min(offset + len(pcm), samples)
+            if end > offset:
+                mix[offset:end] += pcm[:end - offset]
+        return np.clip(mix, -32768, 32767).astype("<i2")
+
+    def write_wav(self, path, duration: Optional[float] = None) -> str:
+        pcm = self.to_array(duration)
+        with wave.open(str(path), "wb") as wav:
+            wav.setnchannels(self.channels)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(pcm.tobytes())
+        return str(path)
+
+
+def concatenate_wav(paths, dest_path, sample_rate: int = 44100, channels: int = 2) -> List[int]:
+    """Decode ``paths`` one at a time and append them to a single WAV at ``dest_path``.
+
+    Only one clip is held in memory at a time, and PCM WAV clips are read
+    without starting ffmpeg. Returns the sample count of each clip, from which
+    exact clip boundaries follow.
+    """
+    counts = []
+    with wave.open(str(dest_path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        for path in paths:
+            pcm = load_pcm(path, sample_rate, channels)
+            wav.writeframes(pcm.tobytes())
+            counts.append(len(pcm))
+    return counts
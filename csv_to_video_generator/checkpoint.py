@@ -0,0 +1,117 @@
+"""Checkpoint journal that lets an interrupted CSV run resume."""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .fsutil import write_json_lines_atomic
+
+CHECKPOINT_VERSION = 2
+
+
+def file_digest(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CheckpointJournal:
+    """Records each finished row clip of a run as soon as it exists.
+
+    The journal is a JSON Lines file: a header naming the CSV digest and the
+    scratch directory holding the run's synthesized audio, then one line
+    appended per finished row, so recording a row costs the same however
+    many rows came before. A run killed at any point leaves a readable
+    record; a torn last line is ignored on load. The file is rewritten
+    compactly when :meth:`start` is called and whenever superseded lines
+    outnumber the live ones. :meth:`resumable` tells whether the scratch
+    directory can be picked up again.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.source: Optional[str] = None
+        self.source_digest: Optional[str] = None
+        self.work_dir: Optional[str] = None
+        self.rows: Dict[int, Dict[str, str]] = {}
+        # Row lines in the file, including ones superseded by a later record.
+        self._lines = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            header = {}
+        if not isinstance(header, dict) or header.get("version") != CHECKPOINT_VERSION:
+            print(f"Warning: ignoring unreadable checkpoint {self.path}")
+            return
+        self.source = header.get("source")
+        self.source_digest = header.get("source_digest")
+        self.work_dir = header.get("work_dir")
+        base = self.path.parent
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A run killed mid-append leaves a torn last line.
+                continue
+            self.rows[entry["row"]] = {"hash": entry["hash"], "clip": str(base / entry["clip"])}
+            self._lines += 1
+
+    def resumable(self, source_digest: str) -> bool:
+        """True when the journal belongs to this CSV content and its scratch directory survives."""
+        return (self.source_digest == source_digest and self.work_dir is not None
+                and os.path.isdir(self.work_dir))
+
+    def clips(self) -> Dict[str, str]:
+        """Row hash -> clip path of every completed row whose clip is still on disk."""
+        return {entry["hash"]: entry["clip"] for entry in self.rows.values()
+                if os.path.isfile(entry["clip"]) and os.path.getsize(entry["clip"]) > 0}
+
+    def start(self, source, source_digest: str, work_dir, keep_rows: bool = False):
+        self.source = str(source)
+        self.source_digest = source_digest
+        self.work_dir = str(work_dir)
+        if not keep_rows:
+            self.rows.clear()
+        self.save()
+
+    def record(self, idx: int, row_hash: str, clip_path: str):
+        self.rows[idx] = {"hash": row_hash, "clip": str(clip_path)}
+        if self._lines >= max(2 * len(self.rows), 64):
+            # Mostly superseded lines (rows re-recorded by resumed runs): compact.
+            self.save()
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self._row_entry(idx), ensure_ascii=False) + "\n")
+        self._lines += 1
+
+    def _row_entry(self, idx: int) -> dict:
+        entry = self.rows[idx]
+        return {"row": idx, "hash": entry["hash"], "clip": os.path.relpath(entry["clip"], self.path.parent)}
+
+    def save(self):
+        """Rewrite the journal with one line per row."""
+        header = {
+            "version": CHECKPOINT_VERSION,
+            "source": self.source,
+            "source_digest": self.source_digest,
+            "work_dir": self.work_dir,
+            "updated": time.time(),
+        }
+        write_json_lines_atomic(self.path, [header] + [self._row_entry(idx) for idx in sorted(self.rows)])
+        self._lines = len(self.rows)
+
+    def remove(self):
+        """Delete the journal once the run it describes has finished."""
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,98 @@
+"""Frame compositing from pre-rendered text layers."""
+from typing import Iterable, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from .glyph_atlas import GlyphAtlas
+from .layout import layout_engine
+
+
+class TextLayer(NamedTuple):
+    """Anti-aliased coverage mask of a text block, placed at (x, y) in the frame."""
+    x: int
+    y: int
+    mask: np.ndarray
+
+
+def render_text_layer(paragraphs: Sequence[str], font, y_pos: int, frame_width: int,
+                      max_width: int, line_spacing: int = 10, paragraph_gap: int = 0,
+                      atlas: Optional[GlyphAtlas] = None) -> Tuple[Optional[TextLayer], int]:
+    """Render centred, wrapped ``paragraphs`` into one mask starting at ``y_pos``.
+
+    Returns the layer (None when there is nothing to draw) and the y position
+    below the block, matching the spacing of drawing each line directly.
+    With ``atlas``, words are blitted from its cache instead of drawn by PIL.
+    """
+    placed = []
+    for text in paragraphs:
+        for line in layout_engine.layout(text, font, max_width):
+            placed.append(((frame_width - line.width) // 2, y_pos, line))
+            y_pos += line.height + line_spacing
+        y_pos += paragraph_gap
+
+    if not placed:
+        return None, y_pos
+
+    left = min(x + line.bbox[0] for x, _, line in placed)
+    top = min(y + line.bbox[1] for _, y, line in placed)
+    right = max(x + line.bbox[2] for x, _, line in placed)
+    bottom = max(y + line.bbox[3] for _, y, line in placed)
+    size = (max(1, right - left), max(1, bottom - top))
+    if atlas is not None:
+        mask = np.zeros((size[1], size[0]), dtype=np.uint8)
+        for x, y, line in placed:
+            atlas.draw_coverage(mask, (x - left, y - top), line.text, font)
+        return TextLayer(left, top, mask), y_pos
+
+    mask = Image.new("L", size, 0)
+    draw = ImageDraw.Draw(mask)
+    for x, y, line in placed:
+        draw.text((x - left, y - top), line.text, font=font, fill=255)
+    return TextLayer(left, top, np.asarray(mask)), y_pos
+
+
+class FrameCompositor:
+    """Blends text layers onto a shared background with NumPy.
+
+    Only the rows and columns a layer covers are touched, so building a
+    frame costs one background copy plus the area of its text.
+    """
+
+    def __init__(self, width: int, height: int, background_color):
+        self.width = width
+        self.height = height
+        self.background = np.empty((height, width, 3), dtype=np.uint8)
+        self.background[:] = background_color
+        self.background.setflags(write=False)
+
+    def blank(self) -> np.ndarray:
+        return self.background.copy()
+
+    def composite(self, frame: np.ndarray, layer: Optional[TextLayer], color) -> np.ndarray:
+        """Blend ``layer`` in ``color`` onto ``frame`` in place."""
+        if layer is None:
+            return frame
+        x0, y0 = max(layer.x, 0), max(layer.y, 0)
+        x1 = min(layer.x + layer.mask.shape[1], self.width)
+        y1 = min(layer.y + layer.mask.shape[0], self.height)
+        if x0 >= x1 or y0 >= y1:
+            return frame
+
+        alpha = layer.mask[y0 - layer.y:y1 - layer.y, x0 - layer.x:x1 - layer.x, None].astype(np.uint16)
+        region = frame[y0:y1, x0:x1]
+        color = np.asarray(color, dtype=np.uint16)
+        region[:] = (region * (255 - alpha) + color * alpha + 127) // 255
+        return frame
+
+    def compose(self, layers: Iterable[Optional[TextLayer]], color,
+                out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Background plus ``layers``, written into ``out`` when given instead of a new array."""
+        if out is None:
+            frame = self.blank()
+        else:
+            frame = out
+            np.copyto(frame, self.background)
+        for layer in layers:
+            self.composite(frame, layer, color)
+        return frame
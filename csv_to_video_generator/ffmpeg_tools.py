@@ -0,0 +1,406 @@
+"""Small helpers around the ffmpeg binary bundled with imageio-ffmpeg."""
+import math
+import os
+import re
+import subprocess
+import tempfile
+import wave
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+import imageio_ffmpeg
+import numpy as np
+
+_VIDEO_STREAM_RE = re.compile(r"Stream #\d+:\d+.*?: Video: (.*)")
+_AUDIO_STREAM_RE = re.compile(r"Stream #\d+:\d+.*?: Audio: (.*)")
+_SIZE_RE = re.compile(r"\b(\d{2,5})x(\d{2,5})\b")
+_PIX_FMT_RE = re.compile(r"\b(yuv\w+|yuvj\w+|rgb\w+|bgr\w+|nv\d+|gray\w*)\b")
+_FPS_RE = re.compile(r"([\d.]+k?) (?:fps|tbr)")
+_TBN_RE = re.compile(r"([\d.]+k?) tbn")
+_SAMPLE_RATE_RE = re.compile(r"(\d+) Hz, ([^,]+)")
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_INPUT_RE = re.compile(r"^Input #(\d+)", re.MULTILINE)
+
+# rawvideo pixel formats of RGB frames piped to ffmpeg, by channel count; the
+# fourth byte of rgb0 (PIL's RGBX layout) is ignored.
+RAW_PIX_FMTS = {3: "rgb24", 4: "rgb0"}
+
+# Inputs per ffmpeg call when probing durations, keeping command lines short.
+PROBE_BATCH_SIZE = 64
+
+
+@dataclass(frozen=True)
+class StreamParams:
+    """Codec parameters that must match for clips to be joined by stream copy."""
+    video_codec: str
+    pix_fmt: Optional[str]
+    width: int
+    height: int
+    fps: Optional[str]
+    time_base: Optional[str]
+    audio_codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channel_layout: Optional[str] = None
+
+
+def ffmpeg_exe() -> str:
+    """Path of the ffmpeg binary (imageio-ffmpeg's bundled one unless IMAGEIO_FFMPEG_EXE is set)."""
+    return imageio_ffmpeg.get_ffmpeg_exe()
+
+
+def _read_header(path: str) -> str:
+    # ffmpeg without an output prints the input description and exits non-zero.
+    result = subprocess.run(
+        [ffmpeg_exe(), "-hide_banner", "-i", path],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    return result.stderr.decode("utf-8", errors="replace")
+
+
+def probe_streams(path: str) -> StreamParams:
+    """Read the first video and audio stream parameters of a media file."""
+    header = _read_header(path)
+
+    video_match = _VIDEO_STREAM_RE.search(header)
+    if video_match is None:
+        raise ValueError(f"No video stream found in {path}")
+    video = video_match.group(1)
+    size = _SIZE_RE.search(video)
+    if size is None:
+        raise ValueError(f"Could not read the frame size of {path}")
+    pix_fmt = _PIX_FMT_RE.search(video)
+    fps = _FPS_RE.search(video)
+    tbn = _TBN_RE.search(video)
+
+    audio_codec = sample_rate = channel_layout = None
+    audio_match = _AUDIO_STREAM_RE.search(header)
+    if audio_match is not None:
+        audio = audio_match.group(1)
+        audio_codec = audio.split()[0].rstrip(",")
+        rate = _SAMPLE_RATE_RE.search(audio)
+        if rate is not None:
+            sample_rate = int(rate.group(1))
+            channel_layout = rate.group(2).strip()
+
+    return StreamParams(
+        video_codec=video.split()[0].rstrip(","),
+        pix_fmt=pix_fmt.group(1) if pix_fmt else None,
+        width=int(size.group(1)),
+        height=int(size.group(2)),
+        fps=fps.group(1) if fps else None,
+        time_base=tbn.group(1) if tbn else None,
+        audio_codec=audio_codec,
+        sample_rate=sample_rate,
+        channel_layout=channel_layout,
+    )
+
+
+def wav_duration(path: str) -> Optional[float]:
+    """Duration of a PCM WAV file read from its header, or None if it isn't one."""
+    try:
+        with wave.open(path, "rb") as wav:
+            return wav.getnframes() / wav.getframerate()
+    except (wave.Error, EOFError, ZeroDivisionError):
+        return None
+
+
+def _parse_durations(header: str, count: int) -> List[Optional[float]]:
+    durations: List[Optional[float]] = [None] * count
+    sections = _INPUT_RE.split(header)
+    # re.split yields [preamble, index, section, index, section, ...].
+    for index, section in zip(sections[1::2], sections[2::2], strict=True):
+        match = _DURATION_RE.search(section)
+        if match is not None and int(index) < count:
+            hours, minutes, seconds = match.groups()
+            durations[int(index)] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    return durations
+
+
+def probe_durations(paths: Sequence[str]) -> List[Optional[float]]:
+    """Durations in seconds of media files, None where it can't be read.
+
+    WAV files are read from their header. Everything else is probed by one
+    ``ffmpeg -i a -i b ...`` call per :data:`PROBE_BATCH_SIZE` files, which
+    prints every input's header and exits, instead of opening a decoder per
+    file. If a file stops the batch early, the rest are probed one by one.
+    """
+    paths = [str(path) for path in paths]
+    durations = [wav_duration(path) if path.lower().endswith(".wav") else None for path in paths]
+    pending = [i for i, duration in enumerate(durations) if duration is None]
+
+    for start in range(0, len(pending), PROBE_BATCH_SIZE):
+        batch = pending[start:start + PROBE_BATCH_SIZE]
+        cmd = [ffmpeg_exe(), "-hide_banner"]
+        for i in batch:
+            cmd += ["-i", paths[i]]
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        header = result.stderr.decode("utf-8", errors="replace")
+        for i, duration in zip(batch, _parse_durations(header, len(batch)), strict=True):
+            durations[i] = duration
+
+        missing = [i for i in batch if durations[i] is None]
+        if len(batch) > 1 and missing:
+            for i in missing:
+                durations[i] = _parse_durations(_read_header(paths[i]), 1)[0]
+    return durations
+
+
+def probe_duration(path: str) -> float:
+    """Duration in seconds of one media file; raises ValueError if it can't be read."""
+    duration = probe_durations([path])[0]
+    if duration is None:
+        raise ValueError(f"Could not read the duration of {path}")
+    return duration
+
+
+def can_stream_copy(paths: Sequence[str]) -> bool:
+    """True when every file shares the codec parameters of the first one."""
+    if not paths:
+        return False
+    try:
+        params = {probe_streams(path) for path in paths}
+    except ValueError:
+        return False
+    return len(params) == 1
+
+
+def _run(cmd: List[str], on_rusage: Optional[Callable] = None):
+    """Run ffmpeg like ``subprocess.run(check=True)``, passing its resource usage to ``on_rusage``."""
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    stderr = proc.stderr.read()
+    proc.stderr.close()
+    if hasattr(os, "wait4"):
+        # Reap the child ourselves to get its own rusage (peak RSS included).
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        if on_rusage is not None:
+            on_rusage(usage)
+    else:
+        proc.wait()
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
+
+
+def _concat_list_line(path: str) -> str:
+    escaped = os.path.abspath(path).replace("'", "'\\''")
+    return f"file '{escaped}'\n"
+
+
+def concat_stream_copy(paths: List[str], output_path: str, on_rusage: Optional[Callable] = None) -> str:
+    """Join clips with the ffmpeg concat demuxer without re-encoding them.
+
+    ``on_rusage`` receives the ``resource.struct_rusage`` of the ffmpeg run.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        list_path = os.path.join(tmp_dir, "concat.txt")
+        with open(list_path, "w", encoding="utf-8") as list_file:
+            list_file.writelines(_concat_list_line(path) for path in paths)
+
+        _run([ffmpeg_exe(), "-y", "-hide_banner", "-loglevel", "error",
+              "-f", "concat", "-safe", "0", "-i", list_path,
+              "-c", "copy", "-movflags", "+faststart", output_path], on_rusage)
+    return output_path
+
+
+def encode_still(frame: np.ndarray, audio_path: str, duration: Optional[float], output_path: str,
+                 fps: float = 24, threads: Optional[int] = None,
+                 audio_codec: str = "aac", sample_rate: int = 44100) -> str:
+    """Encode one still frame held for ``duration`` seconds over an audio track.
+
+    The frame is piped to ffmpeg once and repeated by the ``loop`` filter, and
+    libx264 runs with ``-tune stillimage`` and a single keyframe, so the
+    repeated frames cost almost nothing to encode. With ``duration=None`` the
+    frame is repeated until the audio ends, so the audio needn't be probed.
+    """
+    frame = np.ascontiguousarray(frame, dtype=np.uint8)
+    height, width, channels = frame.shape
+
+    cmd = [
+        ffmpeg_exe(), "-y", "-hide_banner", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", RAW_PIX_FMTS[channels], "-s", f"{width}x{height}",
+        "-framerate", str(fps), "-i", "-",
+        "-i", audio_path,
+    ]
+    if duration is None:
+        cmd += ["-filter:v", "loop=loop=-1:size=1:start=0", "-x264-params", "keyint=infinite"]
+    else:
+        n_frames = max(1, math.ceil(duration * fps))
+        cmd += ["-filter:v", f"loop=loop={n_frames - 1}:size=1:start=0", "-g", str(n_frames)]
+    cmd += [
+        "-map", "0:v", "-map", "1:a",
+        "-c:v", "libx264", "-tune", "stillimage", "-pix_fmt", "yuv420p", "-r", str(fps),
+        "-c:a", audio_codec, "-ar", str(sample_rate), "-ac", "2",
+        "-movflags", "+faststart",
+    ]
+    cmd += ["-shortest"] if duration is None else ["-t", f"{duration:.3f}"]
+    if threads:
+        cmd += ["-threads", str(threads)]
+    cmd.append(output_path)
+
+    proc = subprocess.run(cmd, input=memoryview(frame).cast("B"),
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=proc.stderr)
+    return output_path
+
+
+def decode_pcm(path: str, sample_rate: int = 44100, channels: int = 2) -> np.ndarray:
+    """Decode an audio file once to signed 16-bit PCM, shape ``(samples, channels)``."""
+    cmd = [
+        ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-i", path,
+        "-vn", "-f", "s16le", "-acodec", "pcm_s16le",
+        "-ar", str(sample_rate), "-ac", str(channels), "-",
+    ]
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=proc.stderr)
+    return np.frombuffer(proc.stdout, dtype="<i2").reshape(-1, channels)
+
+
+def _escape_ffmetadata(value: str) -> str:
+    return re.sub(r"([=;#\\\n])", r"\\\1", value)
+
+
+def write_ffmetadata(chapters: Sequence[dict], path: str) -> str:
+    """Write ``{"start", "end", "title"}`` chapters (seconds) as an ffmetadata file."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(";FFMETADATA1\n")
+        for chapter in chapters:
+            f.write("[CHAPTER]\nTIMEBASE=1/1000\n")
+            f.write(f"START={round(chapter['start'] * 1000)}\n")
+            f.write(f"END={round(chapter['end'] * 1000)}\n")
+            f.write(f"title={_escape_ffmetadata(chapter['title'])}\n")
+    return path
+
+
+class StillSequenceEncoder:
+    """One ffmpeg process encoding a sequence of held still frames over one audio track.
+
+    Frames are piped as raw RGB (``rgb24``, or ``rgb0`` for four-byte
+    pixels); :meth:`hold` repeats a frame until the
+    stream reaches the given end time, rounding each boundary to the
+    nearest frame so slide changes never drift from the audio. Use as a
+    context manager; leaving the block finishes the file and raises
+    ``CalledProcessError`` if ffmpeg failed.
+    """
+
+    def __init__(self, output_path: str, width: int, height: int, audio_path: str,
+                 fps: float = 24, threads: Optional[int] = None,
+                 metadata_path: Optional[str] = None, audio_codec: str = "aac",
+                 sample_rate: int = 44100, pix_fmt: str = "rgb24"):
+        self.output_path = output_path
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frames_written = 0
+        self._frame_shape = (height, width, 4 if pix_fmt == "rgb0" else 3)
+        self.cmd = [
+            ffmpeg_exe(), "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", f"{width}x{height}",
+            "-framerate", str(fps), "-i", "-",
+            "-i", audio_path,
+        ]
+        if metadata_path:
+            self.cmd += ["-f", "ffmetadata", "-i", metadata_path, "-map_chapters", "2"]
+        self.cmd += [
+            "-map", "0:v", "-map", "1:a",
+            "-c:v", "libx264", "-tune", "stillimage", "-pix_fmt", "yuv420p", "-r", str(fps),
+            "-c:a", audio_codec, "-ar", str(sample_rate), "-ac", "2",
+            "-movflags", "+faststart",
+        ]
+        if threads:
+            self.cmd += ["-threads", str(threads)]
+        self.cmd.append(output_path)
+        self._proc = None
+        self._stderr = None
+
+    def __enter__(self):
+        # stderr goes to a file: a full pipe would block ffmpeg while we write frames.
+        self._stderr = tempfile.TemporaryFile()
+        self._proc = subprocess.Popen(self.cmd, stdin=subprocess.PIPE,
+                                      stdout=subprocess.DEVNULL, stderr=self._stderr)
+        return self
+
+    def hold(self, frame: np.ndarray, end_time: float):
+        """Show ``frame`` from the current position until ``end_time`` seconds."""
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if frame.shape != self._frame_shape:
+            raise ValueError(f"Frame of shape {frame.shape} does not match {self._frame_shape}")
+        data = memoryview(frame).cast("B")
+        target = round(end_time * self.fps)
+        try:
+            while self.frames_written < target:
+                self._proc.stdin.write(data)
+                self.frames_written += 1
+        except BrokenPipeError:
+            self._finish()
+
+    def _finish(self):
+        with suppress(BrokenPipeError):
+            self._proc.stdin.close()
+        returncode = self._proc.wait()
+        self._stderr.seek(0)
+        stderr = self._stderr.read()
+        self._stderr.close()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, self.cmd, stderr=stderr)
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._stderr.close()
+            return False
+        self._finish()
+        return False
+
+
+def normalize_clip(path: str, output_path: str, width: int, height: int, fps: float,
+                   threads: Optional[int] = None, audio_codec: str = "aac",
+                   sample_rate: int = 44100, on_rusage: Optional[Callable] = None) -> str:
+    """Re-encode one clip to ``width`` x ``height`` at ``fps`` with stereo ``sample_rate`` audio.
+
+    The picture is scaled and padded to keep its aspect ratio, and a clip
+    without audio gets a silent track, so any two normalized clips share
+    every stream parameter and can be joined by stream copy.
+    """
+    video_filter = (f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                    f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={fps},format=yuv420p")
+    has_audio = probe_streams(path).audio_codec is not None
+    cmd = [ffmpeg_exe(), "-y", "-hide_banner", "-loglevel", "error", "-i", path]
+    if not has_audio:
+        cmd += ["-f", "lavfi", "-i", f"anullsrc=r={sample_rate}:cl=stereo", "-shortest"]
+    cmd += [
+        "-map", "0:v:0", "-map", "0:a:0" if has_audio else "1:a",
+        "-filter:v", video_filter, "-c:v", "libx264", "-video_track_timescale", "90000",
+        "-c:a", audio_codec, "-ar", str(sample_rate), "-ac", "2",
+        "-movflags", "+faststart",
+    ]
+    if threads:
+        cmd += ["-threads", str(threads)]
+    cmd.append(output_path)
+    _run(cmd, on_rusage)
+    return output_path
+
+
+def concat_reencode(paths: List[str], output_path: str, width: int, height: int, fps: float,
+                    threads: Optional[int] = None, audio_codec: str = "aac",
+                    sample_rate: int = 44100, on_rusage: Optional[Callable] = None) -> str:
+    """Join clips of differing parameters by normalizing each one, then stream-copying them.
+
+    The concat demuxer needs identical streams, so feeding it mixed clips
+    gives silently wrong output. Each clip is instead re-encoded on its own
+    with :func:`normalize_clip` into a temporary directory next to
+    ``output_path``, and the results are joined by :func:`concat_stream_copy`.
+    One clip is decoded at a time, so memory use does not grow with the
+    number of clips. ``on_rusage`` receives the rusage of every ffmpeg run.
+    """
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_path))) as tmp_dir:
+        normalized = [
+            normalize_clip(path, os.path.join(tmp_dir, f"clip_{i:06d}.mp4"), width, height, fps,
+                           threads, audio_codec, sample_rate, on_rusage)
+            for i, path in enumerate(paths)
+        ]
+        concat_stream_copy(normalized, output_path, on_rusage)
+    return output_path
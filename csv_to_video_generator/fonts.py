@@ -0,0 +1,74 @@
+"""Process-wide font registry so each (path, size) is parsed only once."""
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from PIL import ImageFont
+
+DEFAULT_FONT_CANDIDATES = (
+    "HindVadodara-SemiBold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    str(Path(__file__).resolve().parent.parent / "Fonts" / "Roboto-Medium.ttf"),
+)
+
+
+class FontRegistry:
+    """Resolves a candidate list to the first loadable font and caches loaded faces.
+
+    Fonts are keyed by (path, size); the winner of each candidate list is
+    remembered so the fallback chain is probed once per process, and
+    :meth:`chosen` reports which file was picked.
+    """
+
+    def __init__(self):
+        self._fonts: Dict[Tuple[str, int], ImageFont.FreeTypeFont] = {}
+        self._failed = set()
+        self._chosen: Dict[Tuple[str, ...], Optional[str]] = {}
+
+    def load(self, path: str, size: int) -> ImageFont.FreeTypeFont:
+        key = (path, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = ImageFont.truetype(path, size)
+            self._fonts[key] = font
+        return font
+
+    def get(self, size: int, candidates: Sequence[str] = DEFAULT_FONT_CANDIDATES):
+        candidates = tuple(candidates)
+        if candidates in self._chosen:
+            path = self._chosen[candidates]
+            return self.load(path, size) if path else ImageFont.load_default()
+
+        for path in candidates:
+            if path in self._failed:
+                continue
+            try:
+                font = self.load(path, size)
+            except OSError:
+                self._failed.add(path)
+                continue
+            self._chosen[candidates] = path
+            return font
+
+        print("Warning: Using default font")
+        self._chosen[candidates] = None
+        return ImageFont.load_default()
+
+    def chosen(self, candidates: Sequence[str] = DEFAULT_FONT_CANDIDATES) -> Optional[str]:
+        """Path picked for ``candidates`` (None means PIL's default font), resolving it if needed."""
+        candidates = tuple(candidates)
+        if candidates not in self._chosen:
+            self.get(12, candidates)
+        return self._chosen[candidates]
+
+    def clear(self):
+        self._fonts.clear()
+        self._failed.clear()
+        self._chosen.clear()
+
+
+font_registry = FontRegistry()
+
+
+def get_font(size: int, candidates: Sequence[str] = DEFAULT_FONT_CANDIDATES):
+    return font_registry.get(size, candidates)
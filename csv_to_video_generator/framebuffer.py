@@ -0,0 +1,44 @@
+"""Reusable frame buffers that PIL draws into without copying."""
+from contextlib import contextmanager
+from typing import List
+
+import numpy as np
+from PIL import Image
+
+
+class FrameBufferPool:
+    """Preallocated RGBX frame buffers shared zero-copy with PIL.
+
+    PIL stores RGB pixels as four bytes, so an ``(height, width, 4)`` array
+    can back an image directly through ``Image.frombuffer``: text drawn on
+    the image lands in the array, and the array can be piped to ffmpeg as
+    ``rgb0`` without conversion. The image is in mode ``RGBX``, which some
+    formats (PNG) can't store; save ``Image.fromarray(array[..., :3])``. Each :meth:`frame` resets a free
+    buffer to the background with ``np.copyto`` instead of allocating one,
+    and returns it to the pool when the block exits.
+    """
+
+    pix_fmt = "rgb0"
+
+    def __init__(self, width: int, height: int, background_color):
+        self.width = width
+        self.height = height
+        self.background = np.empty((height, width, 4), dtype=np.uint8)
+        self.background[..., :3] = background_color
+        self.background[..., 3] = 255
+        self.background.setflags(write=False)
+        self._free: List[np.ndarray] = []
+
+    @contextmanager
+    def frame(self):
+        """Yield ``(array, image)`` for one frame; both are only valid inside the block."""
+        buffer = self._free.pop() if self._free else np.empty_like(self.background)
+        np.copyto(buffer, self.background)
+        image = Image.frombuffer("RGB", (self.width, self.height), buffer, "raw", "RGBX", 0, 1)
+        # frombuffer marks mapped images read-only and ImageDraw would then
+        # draw on a private copy; the array is ours and writable.
+        image.readonly = 0
+        try:
+            yield buffer, image
+        finally:
+            self._free.append(buffer)
@@ -0,0 +1,84 @@
+"""Atomic file helpers shared by the pipeline."""
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# os.umask can only be read by setting it; do that once, before any threads start.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def set_default_mode(path_or_fd):
+    """Give a mkstemp file the mode a plain ``open()`` would have created it with.
+
+    mkstemp creates files readable by their owner only, and a rename keeps that.
+    """
+    os.chmod(path_or_fd, 0o666 & ~_UMASK)
+
+
+def _write_atomic(path, write):
+    # Call write(file) on a temp file next to ``path`` and rename it into place.
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            set_default_mode(f.fileno())
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json_atomic(path, payload):
+    """Write JSON to a temp file next to ``path`` and rename it into place."""
+    _write_atomic(path, lambda f: json.dump(payload, f, ensure_ascii=False, indent=2))
+
+
+def write_json_lines_atomic(path, records):
+    """Write one compact JSON document per line, atomically like :func:`write_json_atomic`."""
+    _write_atomic(path, lambda f: f.writelines(json.dumps(record, ensure_ascii=False) + "\n"
+                                               for record in records))
+
+
+def copy_file_atomic(src, dest):
+    """Copy ``src`` to a hidden temp name beside ``dest`` and rename it into place.
+
+    An interrupted copy never leaves a truncated ``dest`` behind.
+    """
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp_path)
+        set_default_mode(tmp_path)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return str(dest)
+
+
+def promote_file(src, dest):
+    """Move a finished file to ``dest`` so readers never see it half-written.
+
+    A rename is atomic on one filesystem; across filesystems the file is first
+    copied to a hidden temp name beside ``dest`` and then renamed.
+    """
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(src, dest)
+        return str(dest)
+    except OSError:
+        pass
+
+    copy_file_atomic(src, dest)
+    os.remove(src)
+    return str(dest)
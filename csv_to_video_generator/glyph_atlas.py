@@ -0,0 +1,140 @@
+"""Text rendering from cached, pre-rasterized glyph runs."""
+import re
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from .layout import layout_engine
+
+_SPACES_RE = re.compile(r"( +)")
+
+
+class GlyphAtlas:
+    """Caches rasterized text runs per font and blits them with NumPy.
+
+    The cache unit is a whitespace-delimited run (a word) rather than a
+    single glyph: each run is rasterized once by PIL itself, so Gujarati
+    conjuncts, matras and any other shaping (through libraqm when PIL has
+    it) come out exactly as ``ImageDraw.text`` draws them, while Latin text
+    still gets a high hit rate because question banks repeat the same words.
+    Runs are placed by their cached advance widths; only the spacing between
+    words can differ from ``ImageDraw.text``, by kerning across a space.
+    The most recently used runs are kept up to ``max_bytes`` of coverage
+    masks; every process (pool workers included) has its own cache.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2**20):
+        self.max_bytes = max_bytes
+        self._runs: "OrderedDict[tuple, Tuple[int, int, np.ndarray]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def run(self, font, text: str) -> Tuple[int, int, np.ndarray]:
+        """``(dx, dy, coverage)`` of ``text`` drawn at the origin with ``font``."""
+        key = (font, text)
+        entry = self._runs.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._runs.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        left, top, right, bottom = font.getbbox(text)
+        mask = Image.new("L", (max(1, right - left), max(1, bottom - top)), 0)
+        ImageDraw.Draw(mask).text((-left, -top), text, font=font, fill=255)
+        entry = (left, top, np.asarray(mask))
+        self._runs[key] = entry
+        self._bytes += entry[2].nbytes
+        while self._bytes > self.max_bytes and len(self._runs) > 1:
+            self._bytes -= self._runs.popitem(last=False)[1][2].nbytes
+        return entry
+
+    def _placements(self, xy, text, font):
+        x, y = xy
+        for part in _SPACES_RE.split(text):
+            if not part:
+                continue
+            if not part.startswith(" "):
+                dx, dy, mask = self.run(font, part)
+                yield round(x) + dx, y + dy, mask
+            x += layout_engine.width(font, part)
+
+    @staticmethod
+    def _clip(shape, x, y, mask):
+        height, width = shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + mask.shape[1], width), min(y + mask.shape[0], height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return (slice(y0, y1), slice(x0, x1)), mask[y0 - y:y1 - y, x0 - x:x1 - x]
+
+    def draw_lines(self, buffer: np.ndarray, lines, font, fill, background):
+        """Draw ``(xy, text)`` lines in colour ``fill`` onto an RGB(X) ``uint8`` buffer, like ``ImageDraw.text``.
+
+        The buffer must hold only the flat ``background`` colour where the
+        text goes, as a freshly reset frame does. The coverage of every run
+        is gathered into one mask, and each line's box is then written in a
+        single lookup through a table of the 256 possible blends of ``fill``
+        over ``background``, instead of blending word by word.
+        """
+        boxes = []
+        for xy, text in lines:
+            runs = [clipped for clipped in (self._clip(buffer.shape, x, y, mask)
+                                            for x, y, mask in self._placements(xy, text, font))
+                    if clipped is not None]
+            if runs:
+                boxes.append(runs)
+        if not boxes:
+            return
+
+        top = min(rows.start for runs in boxes for (rows, _), _ in runs)
+        left = min(cols.start for runs in boxes for (_, cols), _ in runs)
+        bottom = max(rows.stop for runs in boxes for (rows, _), _ in runs)
+        right = max(cols.stop for runs in boxes for (_, cols), _ in runs)
+        coverage = np.zeros((bottom - top, right - left), dtype=np.uint8)
+        for runs in boxes:
+            for (rows, cols), run_coverage in runs:
+                region = coverage[rows.start - top:rows.stop - top, cols.start - left:cols.stop - left]
+                np.maximum(region, run_coverage, out=region)
+
+        alpha = np.arange(256, dtype=np.uint32)[:, None]
+        color = np.asarray(fill[:3], dtype=np.uint32)
+        base = np.asarray(background[:3], dtype=np.uint32)
+        table = np.full((256, buffer.shape[2]), 255, dtype=np.uint8)
+        table[:, :3] = (base * (255 - alpha) + color * alpha + 127) // 255
+        if buffer.shape[2] == 4:
+            # One 32-bit lookup per RGBX pixel instead of four byte lookups.
+            table, target = table.view(np.uint32)[:, 0], buffer.view(np.uint32)[..., 0]
+        else:
+            target = buffer
+
+        # Boxes of neighbouring lines may overlap; both read the combined
+        # coverage, so writing the overlap twice is harmless.
+        for runs in boxes:
+            y0 = min(rows.start for (rows, _), _ in runs)
+            y1 = max(rows.stop for (rows, _), _ in runs)
+            x0 = min(cols.start for (_, cols), _ in runs)
+            x1 = max(cols.stop for (_, cols), _ in runs)
+            target[y0:y1, x0:x1] = table[coverage[y0 - top:y1 - top, x0 - left:x1 - left]]
+
+    def draw_coverage(self, mask: np.ndarray, xy, text: str, font):
+        """Add the coverage of ``text`` to a single-channel ``uint8`` mask."""
+        for x, y, run_mask in self._placements(xy, text, font):
+            clipped = self._clip(mask.shape, x, y, run_mask)
+            if clipped is None:
+                continue
+            (rows, cols), coverage = clipped
+            np.maximum(mask[rows, cols], coverage, out=mask[rows, cols])
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "runs": len(self._runs), "bytes": self._bytes}
+
+    def clear(self):
+        self._runs.clear()
+        self._bytes = 0
+
+
+glyph_atlas = GlyphAtlas()
@@ -0,0 +1,181 @@
+"""Stage-level timing for the video pipeline.
+
+A :class:`Profiler` records one event per stage invocation (CSV parse,
+layout, raster, TTS, encode, concat, ...) and per row, with wall time, CPU
+time (including finished child processes such as ffmpeg), bytes written and
+peak RSS, and exports them as a JSON report or a Chrome trace
+(``chrome://tracing`` / Perfetto).
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from .fsutil import write_json_atomic
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# ru_maxrss is in kilobytes on Linux and bytes on macOS.
+_MAXRSS_SCALE = 1 if sys.platform == "darwin" else 1024
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process and its finished children."""
+    if resource is None:
+        return None
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) * _MAXRSS_SCALE
+
+
+def _reset_own_peak() -> bool:
+    # Writing 5 to clear_refs restarts the kernel's RSS high-water mark (Linux 4.0+).
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _own_peak() -> Optional[int]:
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_SCALE
+
+
+class StepPeakRSS:
+    """Peak RSS of one step: this process inside the block plus its largest child.
+
+    ``ru_maxrss`` only grows over a process's life, so on Linux entering the
+    block resets the high-water mark and leaving it reads ``VmHWM``; where
+    that is unavailable the process's lifetime peak is used. Children are
+    measured from the rusage of each one reaped with :func:`os.wait4`, passed
+    to :meth:`add_child`. Children run while this process waits on them, so
+    the two peaks are added.
+    """
+
+    def __init__(self):
+        self.own: Optional[int] = None
+        self.child = 0
+
+    def __enter__(self):
+        _reset_own_peak()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.own = _own_peak()
+        return False
+
+    def add_child(self, rusage):
+        self.child = max(self.child, rusage.ru_maxrss * _MAXRSS_SCALE)
+
+    @property
+    def bytes(self) -> Optional[int]:
+        if self.own is None and not self.child:
+            return None
+        return (self.own or 0) + self.child
+
+
+def _cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class Profiler:
+    def __init__(self):
+        self.events: List[dict] = []
+        self.started = time.time()
+
+    def __getstate__(self):
+        # Pool workers record into an empty copy and send their events back.
+        state = self.__dict__.copy()
+        state["events"] = []
+        return state
+
+    @contextmanager
+    def stage(self, name: str, row: Optional[int] = None):
+        """Time the enclosed block; set ``bytes_written`` on the yielded dict to record output size."""
+        event = {"stage": name, "bytes_written": 0}
+        if row is not None:
+            event["row"] = row
+        start = time.time()
+        wall = time.perf_counter()
+        cpu = _cpu_seconds()
+        try:
+            yield event
+        finally:
+            event["start"] = start
+            event["wall"] = time.perf_counter() - wall
+            event["cpu"] = _cpu_seconds() - cpu
+            event["peak_rss"] = peak_rss_bytes()
+            event["pid"] = os.getpid()
+            self.events.append(event)
+
+    def merge(self, events: List[dict]):
+        self.events.extend(events)
+
+    def summary(self) -> Dict[str, dict]:
+        stages: Dict[str, dict] = {}
+        for event in self.events:
+            totals = stages.setdefault(event["stage"], {"count": 0, "wall": 0.0, "cpu": 0.0,
+                                                        "bytes_written": 0})
+            totals["count"] += 1
+            totals["wall"] += event["wall"]
+            totals["cpu"] += event["cpu"]
+            totals["bytes_written"] += event["bytes_written"]
+        for totals in stages.values():
+            totals["rows_per_second"] = totals["count"] / totals["wall"] if totals["wall"] else None
+        return stages
+
+    def report(self) -> dict:
+        peaks = [e["peak_rss"] for e in self.events if e.get("peak_rss") is not None]
+        return {
+            "started": self.started,
+            "wall": time.time() - self.started,
+            "peak_rss": max(peaks) if peaks else peak_rss_bytes(),
+            "stages": self.summary(),
+            "events": self.events,
+        }
+
+    def write_report(self, path):
+        write_json_atomic(path, self.report())
+
+    def write_chrome_trace(self, path):
+        trace = [
+            {
+                "name": event["stage"] if "row" not in event else f"{event['stage']} #{event['row'] + 1}",
+                "cat": event["stage"],
+                "ph": "X",
+                "ts": (event["start"] - self.started) * 1e6,
+                "dur": event["wall"] * 1e6,
+                "pid": event["pid"],
+                "tid": event["pid"],
+                "args": {k: event[k] for k in ("row", "cpu", "bytes_written", "peak_rss") if k in event},
+            }
+            for event in self.events
+        ]
+        write_json_atomic(path, {"traceEvents": trace, "displayTimeUnit": "ms"})
+
+
+class NullProfiler(Profiler):
+    """Profiler that records nothing; the default when instrumentation is off."""
+
+    @contextmanager
+    def stage(self, name: str, row: Optional[int] = None):  # noqa: ARG002 - Profiler signature
+        yield {"stage": name, "bytes_written": 0}
+
+
+NULL_PROFILER = NullProfiler()
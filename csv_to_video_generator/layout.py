@@ -0,0 +1,82 @@
+"""Word-wrapping layout engine with cached text measurements."""
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Tuple
+
+from PIL import ImageFont
+
+
+class Line(NamedTuple):
+    text: str
+    bbox: Tuple[int, int, int, int]
+
+    @property
+    def width(self) -> int:
+        return self.bbox[2] - self.bbox[0]
+
+    @property
+    def height(self) -> int:
+        return self.bbox[3] - self.bbox[1]
+
+
+class LayoutEngine:
+    """Wraps text to a maximum width, measuring each word once per font.
+
+    Lines are filled with a running width (word advances plus the space
+    advance), so wrapping is linear in the length of the text; only finished
+    lines are measured again, for their bounding box. Complete layouts are
+    memoized per (text, font, max_width), keeping the ``max_layouts`` most
+    recently used.
+    """
+
+    def __init__(self, max_layouts: int = 4096):
+        self.max_layouts = max_layouts
+        self._widths: Dict[Tuple[ImageFont.FreeTypeFont, str], float] = {}
+        self._layouts: "OrderedDict[tuple, Tuple[Line, ...]]" = OrderedDict()
+
+    def width(self, font, text: str) -> float:
+        key = (font, text)
+        width = self._widths.get(key)
+        if width is None:
+            width = font.getlength(text)
+            self._widths[key] = width
+        return width
+
+    def wrap(self, text: str, font, max_width: int) -> Tuple[str, ...]:
+        space = self.width(font, " ")
+        lines = []
+        current = []
+        current_width = 0.0
+        for word in text.split():
+            word_width = self.width(font, word)
+            if not current:
+                current, current_width = [word], word_width
+            elif current_width + space + word_width <= max_width:
+                current.append(word)
+                current_width += space + word_width
+            else:
+                lines.append(" ".join(current))
+                current, current_width = [word], word_width
+        if current:
+            lines.append(" ".join(current))
+        return tuple(lines)
+
+    def layout(self, text: str, font, max_width: int) -> Tuple[Line, ...]:
+        """Wrapped lines of ``text`` with their bounding boxes."""
+        key = (text, font, max_width)
+        lines = self._layouts.get(key)
+        if lines is not None:
+            self._layouts.move_to_end(key)
+            return lines
+
+        lines = tuple(Line(line, font.getbbox(line)) for line in self.wrap(text, font, max_width))
+        self._layouts[key] = lines
+        if len(self._layouts) > self.max_layouts:
+            self._layouts.popitem(last=False)
+        return lines
+
+    def clear(self):
+        self._widths.clear()
+        self._layouts.clear()
+
+
+layout_engine = LayoutEngine()
@@ -0,0 +1,92 @@
+"""Build manifest for incremental rebuilds.
+
+Each row is identified by a hash of its text and the render settings. Its
+clip is stored under that hash, so a rerun only renders rows whose content
+or settings changed, wherever they moved in the CSV.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .fsutil import write_json_atomic
+
+MANIFEST_VERSION = 1
+
+
+def row_hash(data, render_config: dict) -> str:
+    payload = json.dumps([list(data), render_config], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BuildManifest:
+    """Maps row content hashes to the clips they produced.
+
+    ``known`` holds clips from previous builds that may be reused;
+    ``rows`` is the current build, row index -> (hash, clip path).
+    Clip paths are stored relative to the manifest so the output directory
+    can be moved or restored from a CI cache.
+    """
+
+    def __init__(self, path, clip_dir=None):
+        self.path = Path(path)
+        self.clip_dir = Path(clip_dir) if clip_dir else self.path.parent / f"{self.path.stem}_clips"
+        self.known: Dict[str, str] = {}
+        self.rows: Dict[int, Tuple[str, str]] = {}
+        self.final: Optional[str] = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            print(f"Warning: ignoring unreadable build manifest {self.path}")
+            return
+        if payload.get("version") != MANIFEST_VERSION:
+            return
+        for entry in payload.get("rows", []):
+            self.known[entry["hash"]] = str(self.path.parent / entry["clip"])
+        self.final = payload.get("final")
+
+    def clip_path(self, row_hash: str) -> str:
+        return str(self.clip_dir / f"clip_{row_hash[:24]}.mp4")
+
+    def has_clip(self, row_hash: str) -> bool:
+        """True when an earlier build finished a clip for this hash and it is still on disk."""
+        clip = self.known.get(row_hash)
+        return clip is not None and os.path.isfile(clip) and os.path.getsize(clip) > 0
+
+    def record(self, idx: int, row_hash: str, clip_path: str):
+        self.rows[idx] = (row_hash, str(clip_path))
+        self.known[row_hash] = str(clip_path)
+
+    def clips(self) -> List[str]:
+        """Clips of the current build in row order."""
+        return [clip for _, (_, clip) in sorted(self.rows.items())]
+
+    def save(self, final=None):
+        if final is not None:
+            self.final = str(final)
+        base = self.path.parent
+        write_json_atomic(self.path, {
+            "version": MANIFEST_VERSION,
+            "rows": [
+                {"row": idx, "hash": h, "clip": os.path.relpath(clip, base)}
+                for idx, (h, clip) in sorted(self.rows.items())
+            ],
+            "final": self.final,
+        })
+
+    def prune(self):
+        """Delete clips in ``clip_dir`` that the current build no longer references."""
+        keep = {os.path.abspath(clip) for _, clip in self.rows.values()}
+        if not self.clip_dir.is_dir():
+            return
+        for path in self.clip_dir.glob("clip_*.mp4"):
+            if os.path.abspath(path) not in keep:
+                path.unlink()
+        self.known = dict(self.rows.values())
@@ -0,0 +1,65 @@
+"""Linear timeline of still segments joined by crossfades."""
+from bisect import bisect_right
+from typing import List, NamedTuple
+
+import numpy as np
+
+
+class Segment(NamedTuple):
+    start: float
+    duration: float
+    frame: np.ndarray
+    fade: float
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+
+class Timeline:
+    """Still frames played back to back, each crossfading in over the previous one.
+
+    At most two segments are active at any time, so :meth:`frame_at` finds
+    the current segment by bisection and returns its frame as is outside a
+    transition; only inside the ``transition`` window are the two frames
+    blended.
+    """
+
+    def __init__(self, transition: float = 0.5):
+        self.transition = transition
+        self.segments: List[Segment] = []
+        self._starts: List[float] = []
+
+    def add(self, frame: np.ndarray, duration: float) -> float:
+        """Append a still held for ``duration`` seconds; returns its start time."""
+        if self.segments:
+            previous = self.segments[-1]
+            fade = max(0.0, min(self.transition, previous.duration, duration))
+            start = previous.end - fade
+        else:
+            fade, start = 0.0, 0.0
+        self.segments.append(Segment(start, duration, np.asarray(frame, dtype=np.uint8), fade))
+        self._starts.append(start)
+        return start
+
+    @property
+    def duration(self) -> float:
+        return self.segments[-1].end if self.segments else 0.0
+
+    def frame_at(self, t: float) -> np.ndarray:
+        idx = max(0, bisect_right(self._starts, t) - 1)
+        segment = self.segments[idx]
+        if idx == 0 or t >= segment.start + segment.fade:
+            return segment.frame
+
+        weight = int(256 * (t - segment.start) / segment.fade)
+        # Widen both frames first: numpy < 2 keeps uint8 * scalar in uint8, which wraps.
+        previous = self.segments[idx - 1].frame.astype(np.uint16)
+        current = segment.frame.astype(np.uint16)
+        blended = (previous * (256 - weight) + current * weight) >> 8
+        return blended.astype(np.uint8)
+
+    def to_clip(self):
+        """moviepy clip rendering this timeline frame by frame."""
+        from moviepy.editor import VideoClip
+        return VideoClip(self.frame_at, duration=self.duration)
@@ -0,0 +1,190 @@
+"""Text-to-speech backends.
+
+Every backend exposes ``engine`` (part of the TTS cache key), ``extension``
+(the audio container it writes) and ``synthesize(text, path, lang, tld)``.
+"""
+import json
+import math
+import os
+import shutil
+import struct
+import subprocess
+import urllib.error
+import urllib.request
+import wave
+from typing import Optional, Protocol
+
+
+class TTSBackend(Protocol):
+    engine: str
+    extension: str
+
+    def synthesize(self, text: str, path: str, lang: str = "gu", tld: str = "com") -> None:
+        ...
+
+
+class GTTSBackend:
+    """Google Translate TTS through gTTS (needs network access)."""
+    engine = "gtts"
+    extension = ".mp3"
+
+    def __init__(self, slow: bool = False):
+        self.slow = slow
+        if slow:
+            self.engine = "gtts-slow"
+
+    def synthesize(self, text, path, lang="gu", tld="com"):
+        from gtts import gTTS
+        gTTS(text=text, lang=lang, tld=tld, slow=self.slow).save(path)
+
+
+class OfflineBackend:
+    """Local speech synthesis with espeak-ng/espeak, or pyttsx3 when neither binary exists."""
+    extension = ".wav"
+
+    def __init__(self, voice: Optional[str] = None, rate: Optional[int] = None):
+        self.voice = voice
+        self.rate = rate
+        self.executable = shutil.which("espeak-ng") or shutil.which("espeak")
+        if self.executable is None:
+            try:
+                import pyttsx3  # noqa: F401
+            except ImportError:
+                raise RuntimeError("No offline TTS engine found; install espeak-ng or pyttsx3") from None
+            name = "pyttsx3"
+        else:
+            name = os.path.splitext(os.path.basename(self.executable))[0]
+        # Voice and rate change the audio, so they are part of the cache key.
+        self.engine = f"{name}-{voice}-{rate}"
+
+    def synthesize(self, text, path, lang="gu", tld="com"):  # noqa: ARG002 - TTSBackend signature
+        if self.executable is not None:
+            cmd = [self.executable, "-v", self.voice or lang, "-w", path]
+            if self.rate:
+                cmd += ["-s", str(self.rate)]
+            subprocess.run(cmd + ["--stdin"], input=text.encode("utf-8"), check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            return
+
+        import pyttsx3
+        engine = pyttsx3.init()
+        if self.rate:
+            engine.setProperty("rate", self.rate)
+        if self.voice:
+            engine.setProperty("voice", self.voice)
+        engine.save_to_file(text, path)
+        engine.runAndWait()
+
+
+class StubBackend:
+    """Deterministic offline stand-in: a WAV whose length is proportional to the text.
+
+    Writes silence, or a sine tone when ``tone_hz`` is set, so the render path
+    can be tested and benchmarked without network or speech engines.
+    """
+    extension = ".wav"
+
+    def __init__(self, seconds_per_char: float = 0.06, min_duration: float = 0.5,
+                 tone_hz: Optional[float] = None, sample_rate: int = 22050):
+        self.seconds_per_char = seconds_per_char
+        self.min_duration = min_duration
+        self.tone_hz = tone_hz
+        self.sample_rate = sample_rate
+        self.engine = f"stub-{seconds_per_char}-{min_duration}-{tone_hz}-{sample_rate}"
+
+    def duration(self, text: str) -> float:
+        return max(self.min_duration, len(text) * self.seconds_per_char)
+
+    def synthesize(self, text, path, lang="gu", tld="com"):  # noqa: ARG002 - TTSBackend signature
+        n_samples = int(round(self.duration(text) * self.sample_rate))
+        if self.tone_hz:
+            step = 2 * math.pi * self.tone_hz / self.sample_rate
+            samples = (int(8000 * math.sin(step * i)) for i in range(n_samples))
+            frames = struct.pack(f"<{n_samples}h", *samples)
+        else:
+            frames = bytes(2 * n_samples)
+
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(frames)
+
+
+class TTSHTTPError(RuntimeError):
+    """Non-2xx answer from an HTTP speech service; ``status`` drives retries."""
+
+    def __init__(self, status: int, message: str = "", retry_after: Optional[float] = None):
+        super().__init__(f"TTS service returned HTTP {status}: {message}".rstrip(": "))
+        self.status = status
+        self.retry_after = retry_after
+
+
+class HTTPBackend:
+    """Speech from an HTTP service that answers a JSON POST with audio bytes.
+
+    The request body is ``{"text": ..., "lang": ..., "tld": ...}``. Point
+    ``url`` at a local fake server to exercise retries and rate limits offline.
+    """
+
+    def __init__(self, url: str, extension: str = ".mp3", timeout: float = 30.0):
+        if not url:
+            raise ValueError("HTTPBackend needs a service URL")
+        self.url = url
+        self.extension = extension
+        self.timeout = timeout
+        self.engine = f"http:{url}"
+
+    def synthesize(self, text, path, lang="gu", tld="com"):
+        body = json.dumps({"text": text, "lang": lang, "tld": tld}).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                audio = response.read()
+        except urllib.error.HTTPError as e:
+            retry_after = e.headers.get("Retry-After") if e.headers else None
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            raise TTSHTTPError(e.code, e.reason, retry_after) from e
+
+        with open(path, "wb") as audio_file:
+            audio_file.write(audio)
+
+
+BACKENDS = {
+    "gtts": GTTSBackend,
+    "offline": OfflineBackend,
+    "stub": StubBackend,
+    "http": HTTPBackend,
+}
+
+
+def get_backend(name: str = "gtts", **kwargs) -> TTSBackend:
+    """Instantiate a backend by name: ``gtts``, ``offline``, ``stub`` or ``http``."""
+    try:
+        return BACKENDS[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown TTS backend: {name} (choose from {', '.join(BACKENDS)})") from None
+
+
+def synthesize_speech(text: str, path, backend: Optional[TTSBackend] = None,
+                      lang: str = "gu", tld: str = "com", cache=None) -> str:
+    """Synthesize ``text`` into ``path`` with ``backend`` (gTTS by default), through ``cache`` if given."""
+    backend = backend or GTTSBackend()
+    path = str(path)
+
+    def synthesize(dest_path):
+        # Write under a temporary name so an interrupted run never leaves a
+        # truncated file that a resumed run would take for finished audio.
+        root, ext = os.path.splitext(dest_path)
+        partial_path = f"{root}.part{ext}"
+        backend.synthesize(text, partial_path, lang=lang, tld=tld)
+        os.replace(partial_path, dest_path)
+
+    if cache is None:
+        synthesize(path)
+        return path
+    return cache.fetch(text, path, synthesize, lang=lang, tld=tld, engine=backend.engine)
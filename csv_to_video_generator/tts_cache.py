@@ -0,0 +1,132 @@
+"""Persistent, content-addressed cache for synthesized speech."""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+from .fsutil import copy_file_atomic
+
+DEFAULT_MAX_BYTES = 1024 ** 3
+
+
+def default_cache_dir() -> Path:
+    """Cache location: $CSV_TO_VIDEO_TTS_CACHE, else the user's cache directory."""
+    if os.environ.get("CSV_TO_VIDEO_TTS_CACHE"):
+        return Path(os.environ["CSV_TO_VIDEO_TTS_CACHE"])
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "csv_to_video_generator" / "tts"
+
+
+class TTSCache:
+    """On-disk cache of speech files keyed by a hash of (text, lang, tld, engine).
+
+    Entries are written atomically, so several processes can share one cache
+    directory. A hit refreshes the entry's mtime, and once the directory grows
+    past ``max_bytes`` the least recently used entries are evicted.
+    ``hits``/``misses``/``evictions`` count activity in this process only.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = None
+
+    @staticmethod
+    def key(text: str, lang: str, tld: str, engine: str) -> str:
+        payload = json.dumps([engine, lang, tld, text], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str, suffix: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str = ".mp3") -> Optional[Path]:
+        path = self._entry_path(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, source_path, suffix: str = ".mp3") -> Path:
+        path = self._entry_path(key, suffix)
+        copy_file_atomic(source_path, path)
+
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += path.stat().st_size
+        if self._size > self.max_bytes:
+            self.evict()
+        return path
+
+    def lookup(self, text: str, dest_path, lang: str = "gu", tld: str = "com",
+               engine: str = "gtts") -> bool:
+        """Copy the cached speech for ``text`` to ``dest_path``; False (and no count) on a miss."""
+        dest_path = str(dest_path)
+        cached = self.get(self.key(text, lang, tld, engine), Path(dest_path).suffix or ".mp3")
+        if cached is None:
+            return False
+        self.hits += 1
+        # Through a temp name: a copy cut short must not look like finished audio to --resume.
+        copy_file_atomic(cached, dest_path)
+        return True
+
+    def fetch(self, text: str, dest_path, synthesize: Callable[[str], None],
+              lang: str = "gu", tld: str = "com", engine: str = "gtts") -> str:
+        """Copy the cached speech for ``text`` to ``dest_path``, synthesizing it on a miss.
+
+        ``synthesize`` is called with ``dest_path`` and must write the audio there.
+        """
+        dest_path = str(dest_path)
+        if self.lookup(text, dest_path, lang=lang, tld=tld, engine=engine):
+            return dest_path
+
+        self.misses += 1
+        synthesize(dest_path)
+        self.put(self.key(text, lang, tld, engine), dest_path, Path(dest_path).suffix or ".mp3")
+        return dest_path
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        return [p for p in self.cache_dir.glob("*/*") if p.is_file() and p.suffix != ".tmp"]
+
+    def _scan_size(self) -> int:
+        return sum(p.stat().st_size for p in self._entries())
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def cached_gtts(text: str, dest_path, lang: str = "gu", tld: str = "com",
+                cache: Optional[TTSCache] = None) -> str:
+    """Synthesize ``text`` with gTTS into ``dest_path``, going through ``cache`` if given."""
+    from .tts import GTTSBackend, synthesize_speech
+    return synthesize_speech(text, dest_path, GTTSBackend(), lang=lang, tld=tld, cache=cache)
@@ -0,0 +1,131 @@
+"""Concurrent, rate-limited speech synthesis on asyncio."""
+import asyncio
+import random
+import time
+import urllib.error
+from typing import Iterable, List, Optional, Tuple
+
+from .tts import GTTSBackend, TTSBackend, synthesize_speech
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def error_status(exc: BaseException) -> Optional[int]:
+    """HTTP status carried by a TTS error (gTTSError keeps the response in ``rsp``)."""
+    for attr in ("status", "status_code", "code"):
+        status = getattr(exc, attr, None)
+        if isinstance(status, int):
+            return status
+    response = getattr(exc, "rsp", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    status = error_status(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return isinstance(exc, (ConnectionError, TimeoutError, urllib.error.URLError))
+
+
+class TokenBucket:
+    """Allows ``rate`` acquisitions per second with bursts of up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncTTSScheduler:
+    """Runs many synthesis requests concurrently on worker threads.
+
+    At most ``max_in_flight`` requests run at once and, when ``rate`` is set,
+    no more than ``rate`` requests per second start (bursts up to ``burst``).
+    Errors with a 429/5xx status or a network failure are retried up to
+    ``max_retries`` times with jittered exponential backoff, honouring a
+    ``retry_after`` hint when the error carries one. Cache hits skip both
+    limits.
+    """
+
+    def __init__(self, backend: Optional[TTSBackend] = None, cache=None,
+                 max_in_flight: int = 4, rate: Optional[float] = None,
+                 burst: Optional[float] = None, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 30.0,
+                 lang: str = "gu", tld: str = "com"):
+        self.backend = backend or GTTSBackend()
+        self.cache = cache
+        self.max_in_flight = max_in_flight
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lang = lang
+        self.tld = tld
+        self.retries = 0
+        self._semaphore = None
+        self._loop = None
+
+    def _get_semaphore(self):
+        # asyncio primitives are tied to the loop they were first used on.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        retry_after = getattr(exc, "retry_after", None)
+        if retry_after:
+            return min(self.max_delay, retry_after)
+        cap = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    async def synthesize(self, text: str, path, lang: Optional[str] = None,
+                         tld: Optional[str] = None) -> str:
+        lang = lang or self.lang
+        tld = tld or self.tld
+        path = str(path)
+
+        if self.cache is not None and self.cache.lookup(text, path, lang=lang, tld=tld,
+                                                        engine=self.backend.engine):
+            return path
+
+        async with self._get_semaphore():
+            for attempt in range(self.max_retries + 1):
+                if self.bucket is not None:
+                    await self.bucket.acquire()
+                try:
+                    return await asyncio.to_thread(synthesize_speech, text, path, self.backend,
+                                                   lang, tld, self.cache)
+                except Exception as exc:
+                    if attempt >= self.max_retries or not is_retryable(exc):
+                        raise
+                    self.retries += 1
+                    await asyncio.sleep(self._backoff(attempt, exc))
+
+    async def synthesize_many(self, jobs: Iterable[Tuple[str, str]],
+                              return_exceptions: bool = False) -> List:
+        """Synthesize ``(text, path)`` jobs concurrently; results keep the input order."""
+        return await asyncio.gather(*(self.synthesize(text, path) for text, path in jobs),
+                                    return_exceptions=return_exceptions)
+
+    def run(self, jobs: Iterable[Tuple[str, str]]) -> List:
+        """Blocking wrapper: returns a path or the raised exception for each job."""
+        return asyncio.run(self.synthesize_many(list(jobs), return_exceptions=True))
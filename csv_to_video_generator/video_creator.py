@@ -1,12 +1,106 @@
+import copy
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Optional
+
 import pandas as pd
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import textwrap
-from gtts import gTTS
-from moviepy.editor import ImageClip, AudioFileClip, VideoFileClip, concatenate_videoclips
+from moviepy.editor import ImageClip, AudioFileClip
+
+from .audio import concatenate_wav
+from .framebuffer import FrameBufferPool
+from .fsutil import promote_file, set_default_mode, write_json_atomic
+from .glyph_atlas import glyph_atlas as shared_glyph_atlas
+from .instrumentation import NULL_PROFILER, StepPeakRSS
+from .manifest import row_hash
+from .fonts import DEFAULT_FONT_CANDIDATES, font_registry, get_font
+from .ffmpeg_tools import (StillSequenceEncoder, can_stream_copy, concat_reencode, concat_stream_copy, encode_still,
+                           probe_durations, write_ffmetadata)
+from .tts import GTTSBackend, synthesize_speech
+from .tts_cache import TTSCache
+from .tts_scheduler import AsyncTTSScheduler
+
+PIPELINE_STAGES = ("images", "audio", "clips", "final")
+# Bump when a change to rendering or encoding alters the clips produced for
+# the same input, so build manifests stop reusing older clips.
+RENDER_VERSION = 1
+
+
+@dataclass(frozen=True)
+class FinalizeResult:
+    """Outcome of create_final_video: how the clips were joined and what it cost."""
+    path: str
+    method: str
+    clips: int
+    seconds: float
+    # Peak RSS of the join, in bytes: this process during it plus its largest ffmpeg child.
+    peak_rss: Optional[int]
+
+
+def _is_valid(path, *inputs):
+    # A stage output is reusable when it is non-empty and newer than what it was built from.
+    try:
+        mtime = os.path.getmtime(path)
+        if os.path.getsize(path) == 0:
+            return False
+    except OSError:
+        return False
+    return all(mtime >= os.path.getmtime(source) for source in inputs if os.path.exists(source))
+
+
+class _LazyRows:
+    """Re-iterable view over a row iterator that only pulls rows when they are needed.
+
+    Rows already pulled are kept so later pipeline stages can walk them again;
+    the source (e.g. a streaming CSV reader) is consumed at most once.
+
+    Keeping every row is deliberate. The point of streaming is to start
+    rendering before the CSV is parsed, not to bound memory. The stages after
+    the first one re-iterate the rows (clips after audio, the retry pass,
+    ``len()`` for the final join). A row is a few short strings, which is
+    small next to one frame buffer, so a 10k-row bank costs a few MB here.
+    """
+
+    def __init__(self, rows):
+        self._rows = []
+        self._source = iter(rows)
+
+    def _pull(self):
+        if self._source is None:
+            return False
+        try:
+            self._rows.append(next(self._source))
+        except StopIteration:
+            self._source = None
+            return False
+        return True
+
+    def __iter__(self):
+        idx = 0
+        while idx < len(self._rows) or self._pull():
+            yield self._rows[idx]
+            idx += 1
+
+    def __len__(self):
+        while self._pull():
+            pass
+        return len(self._rows)
+
+    def __bool__(self):
+        return bool(self._rows) or self._pull()
+
 
 class GyanDariyoVideoCreator:
-    def __init__(self, data_list, image_width=1920, image_height=1080, background_color=(255, 229, 244), font_color=(229, 0, 135), font_size=90, line_spacing=10, margin=80, default_fps=24):
-        self.data_list = data_list
+    def __init__(self, data_list, image_width=1920, image_height=1080, background_color=(255, 229, 244), font_color=(229, 0, 135), font_size=90, line_spacing=10, margin=80, default_fps=24, workers=1, tts_cache=None, reuse_existing=False, font_paths=DEFAULT_FONT_CANDIDATES, save_images=False, preview=False, encode_mode="still", still_fps=None, tts_backend=None, tts_lang="gu", tts_concurrency=1, tts_rate=None, manifest=None, work_dir=None, output_path="Gyan_Dariyo_final_video.mp4", profiler=None, checkpoint=None, glyph_atlas=False):
+        # Any iterable works; generators are consumed lazily as rows are rendered.
+        self.data_list = data_list if isinstance(data_list, (list, tuple)) else _LazyRows(data_list)
         self.image_width = image_width
         self.image_height = image_height
         self.background_color = background_color
@@ -15,78 +109,576 @@ class GyanDariyoVideoCreator:
         self.line_spacing = line_spacing
         self.margin = margin
         self.default_fps = default_fps
+        self.workers = workers
+        self.failed_rows = {}
+        # None uses the shared on-disk cache, False disables caching.
+        self.tts_cache = TTSCache() if tts_cache is None else (tts_cache or None)
+        # Trust stage outputs left on disk by an earlier run, not only the
+        # ones produced by this instance.
+        self.reuse_existing = reuse_existing
+        self.tts_backend = tts_backend or GTTSBackend()
+        self.tts_lang = tts_lang
+        # Above 1, create_audio overlaps requests through AsyncTTSScheduler;
+        # tts_rate caps requests per second.
+        self.tts_concurrency = tts_concurrency
+        self.tts_rate = tts_rate
+        self._produced = {stage: set() for stage in PIPELINE_STAGES}
+        # Audio path -> duration, filled in one batched probe after create_audio.
+        self._durations = {}
+        self.font_paths = tuple(font_paths)
+        # Frames are rendered in memory; PNGs are only written for debugging.
+        self.save_images = save_images
+        self.preview = preview
+        # "still" pipes each slide to ffmpeg once and lets it repeat the frame;
+        # "moviepy" renders every frame through ImageClip.write_videofile;
+        # "session" skips per-row clips and streams every row through one
+        # encoder straight into the final video (see create_session_video).
+        if encode_mode not in ("still", "moviepy", "session"):
+            raise ValueError(f"Unknown encode_mode: {encode_mode}")
+        self.encode_mode = encode_mode
+        self.still_fps = still_fps or default_fps
+        # Slides are drawn into reused buffers; created on first use (see frame_pool).
+        self._frame_pool = None
+        # Draw text by blitting word bitmaps cached in the process-wide
+        # GlyphAtlas instead of rasterizing it through ImageDraw.text.
+        self.glyph_atlas = glyph_atlas
+        # Per-row {"row", "start", "end", "title"} marks of the last session encode.
+        self.chapters = []
+        # FinalizeResult of the last create_final_video call.
+        self.finalize_result = None
+        # BuildManifest: reuse clips of unchanged rows from earlier builds.
+        self.manifest = manifest
+        # Intermediate files go to a private scratch directory so concurrent
+        # jobs never share file names; only the final video is promoted to
+        # output_path once it is complete.
+        self._owns_work_dir = work_dir is None
+        self.work_dir = tempfile.mkdtemp(prefix="gyan_dariyo_") if work_dir is None else str(work_dir)
+        os.makedirs(self.work_dir, exist_ok=True)
+        self.output_path = output_path
+        # instrumentation.Profiler collecting per-stage and per-row timings.
+        self.profiler = profiler or NULL_PROFILER
+        # checkpoint.CheckpointJournal updated as soon as each row's clip is done.
+        self.checkpoint = checkpoint
+
+    def __getstate__(self):
+        # Pool workers get their row passed explicitly; don't ship the whole
+        # bank (or an unpicklable row iterator) with every task.
+        state = self.__dict__.copy()
+        state["data_list"] = []
+        # Only the parent process writes the checkpoint journal.
+        state["checkpoint"] = None
+        # Each worker allocates its own frame buffers.
+        state["_frame_pool"] = None
+        # These grow with the bank; create_videos passes each row its reusable
+        # clip, audio duration and whether its audio is done instead. Workers
+        # only need clip_dir.
+        if self.manifest is not None:
+            manifest = copy.copy(self.manifest)
+            manifest.known, manifest.rows = {}, {}
+            state["manifest"] = manifest
+        state["_durations"] = {}
+        state["_produced"] = {stage: set() for stage in PIPELINE_STAGES}
+        state["failed_rows"] = {}
+        return state
+
+    @property
+    def font_path(self):
+        # Font file actually used for rendering; None means PIL's default font.
+        return font_registry.chosen(self.font_paths)
+
+    def render_config(self):
+        """Settings that change a row's clip; part of the manifest row hash."""
+        config = {
+            "render_version": RENDER_VERSION,
+            "size": [self.image_width, self.image_height],
+            "background_color": list(self.background_color),
+            "font_color": list(self.font_color),
+            "font_size": self.font_size,
+            "line_spacing": self.line_spacing,
+            "margin": self.margin,
+            "font": self.font_path,
+            "fps": self.default_fps,
+            "encode_mode": self.encode_mode,
+            "still_fps": self.still_fps,
+            "tts_engine": self.tts_backend.engine,
+            "tts_lang": self.tts_lang,
+        }
+        if self.glyph_atlas:
+            # Only present when enabled, so existing manifests keep their hashes.
+            config["glyph_atlas"] = True
+        return config
 
-    def create_images(self):
+    def row_hash(self, data):
+        return row_hash(data, self.render_config())
+
+    def _reusable_clip(self, data):
+        if self.manifest is None:
+            return None
+        key = self.row_hash(data)
+        return self.manifest.clip_path(key) if self.manifest.has_clip(key) else None
+
+    def image_path(self, idx):
+        return os.path.join(self.work_dir, f"Gyan_Dariyo_image_{idx+1}.png")
+
+    def audio_path(self, idx):
+        return os.path.join(self.work_dir, f"Gyan_Dariyo_audio_{idx+1}{self.tts_backend.extension}")
+
+    def video_path(self, idx):
+        return os.path.join(self.work_dir, f"Gyan_Dariyo_video_{idx+1}.mp4")
+
+    def cleanup(self):
+        """Remove the scratch directory if this instance created it."""
+        if self._owns_work_dir and os.path.isdir(self.work_dir):
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _can_skip(self, stage, idx, path, *inputs, produced=None):
+        # produced: whether this run already made the output, when the caller
+        # knows better than self._produced (e.g. in a pool worker).
+        if produced is None:
+            produced = idx in self._produced[stage]
+        if not produced and not self.reuse_existing:
+            return False
+        return _is_valid(path, *inputs)
+
+    def _layout(self, data):
+        placed = []
+        y_position = self.margin
+
+        for text in data:
+            wrapped_text = textwrap.fill(text, width=40)
+            lines = wrapped_text.split('\n')
+
+            for line in lines:
+                placed.append((line, y_position))
+                y_position += self.font_size + self.line_spacing
+
+            y_position += self.line_spacing
+
+        return placed
+
+    @property
+    def frame_pool(self):
+        if self._frame_pool is None:
+            self._frame_pool = FrameBufferPool(self.image_width, self.image_height, self.background_color)
+        return self._frame_pool
+
+    @contextmanager
+    def _rendered(self, data):
+        """Draw one row's slide into a pooled buffer; yields ``(array, image)``, valid inside the block.
+
+        ``array`` is the (height, width, 4) RGBX buffer backing ``image``, ready
+        to pipe to ffmpeg as ``rgb0`` without a copy.
+        """
+        with self.profiler.stage("layout"):
+            placed = self._layout(data)
+
+        with self.frame_pool.frame() as (buffer, image):
+            with self.profiler.stage("raster"):
+                font = get_font(self.font_size, self.font_paths)
+                if self.glyph_atlas:
+                    shared_glyph_atlas.draw_lines(buffer, [((self.margin, y_position), line)
+                                                           for line, y_position in placed],
+                                                  font, self.font_color, self.background_color)
+                else:
+                    draw = ImageDraw.Draw(image)
+                    for line, y_position in placed:
+                        draw.text((self.margin, y_position), line, font=font, fill=self.font_color)
+            yield buffer, image
+
+    def render_frame(self, data):
+        """Render one row's slide as an RGB ``uint8`` array of shape (height, width, 3)."""
+        with self._rendered(data) as (buffer, _):
+            return buffer[..., :3].copy()
+
+    def iter_frames(self):
         for idx, data in enumerate(self.data_list):
-            image = Image.new("RGB", (self.image_width, self.image_height), self.background_color)
-            draw = ImageDraw.Draw(image)
+            yield idx, self.render_frame(data)
 
-            # Try to load font with fallback options
-            try:
-                font = ImageFont.truetype("HindVadodara-SemiBold.ttf", self.font_size)
-            except OSError:
-                # Try system fonts as fallback
-                font_paths = [
-                    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-                    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-                ]
-                font = None
-                for font_path in font_paths:
+    def create_images(self, save=None):
+        """Write the slides as PNG files for debugging; the video path never reads them.
+
+        Does nothing unless ``save`` (default: ``self.save_images``) is set.
+        Returns the paths written.
+        """
+        save = self.save_images if save is None else save
+        if not save:
+            return []
+
+        image_paths = []
+        for idx, data in enumerate(self.data_list):
+            image_path = self.image_path(idx)
+            image_paths.append(image_path)
+            if self._can_skip("images", idx, image_path):
+                continue
+            with self._rendered(data) as (buffer, _):
+                # The pooled image is RGBX, which PNG can't store; save the RGB channels.
+                image = Image.fromarray(buffer[..., :3])
+                with self.profiler.stage("save_image", row=idx) as event:
+                    image.save(image_path)
+                    event["bytes_written"] = os.path.getsize(image_path)
+                if self.preview:
+                    image.show()
+            self._produced["images"].add(idx)
+        return image_paths
+
+    def _ensure_audio(self, idx, data, ready=None):
+        audio_file_path = self.audio_path(idx)
+        if not self._can_skip("audio", idx, audio_file_path, produced=ready):
+            text_to_speak = "\n".join(data)
+            with self.profiler.stage("tts", row=idx) as event:
+                synthesize_speech(text_to_speak, audio_file_path, self.tts_backend,
+                                  lang=self.tts_lang, cache=self.tts_cache)
+                event["bytes_written"] = os.path.getsize(audio_file_path)
+            self._produced["audio"].add(idx)
+        return audio_file_path
+
+    def create_audio(self):
+        if self.tts_concurrency <= 1:
+            for idx, data in enumerate(self.data_list):
+                self._ensure_audio(idx, data)
+        else:
+            self._synthesize_concurrently()
+        self._probe_durations()
+
+    def _probe_durations(self):
+        paths = [self.audio_path(idx) for idx in sorted(self._produced["audio"])]
+        with self.profiler.stage("probe"):
+            for path, duration in zip(paths, probe_durations(paths), strict=True):
+                if duration is not None:
+                    self._durations[path] = duration
+
+    def _synthesize_concurrently(self):
+
+        pending = [(idx, data) for idx, data in enumerate(self.data_list)
+                   if not self._can_skip("audio", idx, self.audio_path(idx))
+                   and self._reusable_clip(data) is None]
+        scheduler = AsyncTTSScheduler(self.tts_backend, self.tts_cache,
+                                      max_in_flight=self.tts_concurrency, rate=self.tts_rate,
+                                      lang=self.tts_lang)
+        with self.profiler.stage("tts") as event:
+            results = scheduler.run(("\n".join(data), self.audio_path(idx)) for idx, data in pending)
+            event["bytes_written"] = sum(os.path.getsize(r) for r in results if isinstance(r, str))
+        for (idx, _), result in zip(pending, results, strict=True):
+            if isinstance(result, BaseException):
+                # The clip stage retries rows whose audio is still missing.
+                print(f"Warning: speech for row {idx+1} failed: {type(result).__name__}: {result}")
+            else:
+                self._produced["audio"].add(idx)
+
+    def _create_video(self, idx, data, logger="bar", threads=None, reusable=None, duration=None,
+                      audio_ready=None):
+        with self.profiler.stage("row", row=idx) as event:
+            video_file_path = self._build_clip(idx, data, logger, threads, reusable, duration,
+                                               audio_ready)
+            event["bytes_written"] = os.path.getsize(video_file_path)
+        return video_file_path
+
+    def _build_clip(self, idx, data, logger="bar", threads=None, reusable=None, duration=None,
+                    audio_ready=None):
+        # reusable: clip of an earlier build to use as is; duration: the
+        # row's audio length when already probed; audio_ready: whether the
+        # audio stage already produced this row's audio (None: look it up).
+        if reusable is not None:
+            return reusable
+        if self.manifest is not None:
+            video_file_path = self.manifest.clip_path(self.row_hash(data))
+            os.makedirs(os.path.dirname(video_file_path), exist_ok=True)
+        else:
+            video_file_path = self.video_path(idx)
+
+        audio_file_path = self._ensure_audio(idx, data, audio_ready)
+        if self._can_skip("clips", idx, video_file_path, audio_file_path):
+            return video_file_path
+
+        # Without a probed duration the still encoder stops at the end of the
+        # audio and moviepy reads the length from the decoder it opens anyway,
+        # so no extra ffmpeg process is started per row.
+        audio_duration = duration or self._durations.get(audio_file_path)
+
+        # Encode under a unique temporary name so an interrupted run never
+        # leaves a truncated clip behind under the real one, and two encodes
+        # of the same clip never write the same file.
+        fd, partial_path = tempfile.mkstemp(suffix=".part.mp4", dir=os.path.dirname(video_file_path),
+                                            prefix=f"{os.path.basename(video_file_path)[:-4]}.")
+        set_default_mode(fd)
+        os.close(fd)
+        try:
+            with self._rendered(data) as (frame, _), self.profiler.stage("encode", row=idx) as event:
+                if self.encode_mode == "still":
+                    encode_still(frame, audio_file_path, audio_duration, partial_path,
+                                 fps=self.still_fps, threads=threads)
+                else:
+                    audio_clip = AudioFileClip(audio_file_path)
                     try:
-                        font = ImageFont.truetype(font_path, self.font_size)
-                        break
-                    except OSError:
-                        continue
-                if font is None:
-                    print("Warning: Using default font")
-                    font = ImageFont.load_default()
+                        image_clip = ImageClip(frame[..., :3])
+                        video_clip = (image_clip.set_audio(audio_clip)
+                                      .set_duration(audio_duration or audio_clip.duration)
+                                      .set_fps(self.default_fps))
+                        video_clip.write_videofile(partial_path, codec="libx264", audio_codec="aac",
+                                                   logger=logger, threads=threads)
+                    finally:
+                        audio_clip.close()
+                event["bytes_written"] = os.path.getsize(partial_path)
+            os.replace(partial_path, video_file_path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        self._produced["clips"].add(idx)
+        return video_file_path
 
-            y_position = self.margin
+    def _create_video_in_worker(self, idx, data, logger=None, threads=None, reusable=None, duration=None,
+                                audio_ready=None):
+        # Counters and profiler events on the pickled copies don't reach the
+        # parent, so send back what this row added to them.
+        before = self.tts_cache.stats() if self.tts_cache else {}
+        video_file_path = self._create_video(idx, data, logger, threads, reusable, duration,
+                                             audio_ready)
+        after = self.tts_cache.stats() if self.tts_cache else {}
+        return video_file_path, {k: after[k] - before[k] for k in after}, self.profiler.events
 
-            for text in data:
-                wrapped_text = textwrap.fill(text, width=40)
-                lines = wrapped_text.split('\n')
+    def create_videos(self, workers=None):
+        """Render one clip per row, optionally across a process pool.
 
-                for line in lines:
-                    draw.text((self.margin, y_position), line, font=font, fill=self.font_color)
-                    y_position += self.font_size + self.line_spacing
+        The returned list follows ``data_list`` order regardless of which
+        worker finishes first. Rows that raise are recorded in
+        ``self.failed_rows`` (row index -> error message) and left out of the
+        list instead of aborting the batch.
+        """
+        workers = self.workers if workers is None else workers
+        if workers == 0:
+            workers = os.cpu_count() or 1
 
-                y_position += self.line_spacing
+        self.failed_rows = {}
+        results = {}
 
-            image.save(f"Gyan_Dariyo_image_{idx+1}.png")
-            image.show()
+        if workers <= 1:
+            # Row hash -> clip (or error) of a rendered row, given to identical rows.
+            outcomes = {}
+            for key, idx, data in self._keyed_rows():
+                outcome = outcomes.get(key)
+                if outcome is None:
+                    try:
+                        outcome = self._create_video(idx, data, reusable=self._reusable_clip(data),
+                                                     duration=self._row_duration(idx))
+                    except Exception as e:
+                        outcome = e
+                    if key is not None:
+                        outcomes[key] = outcome
+                if isinstance(outcome, Exception):
+                    self._fail_rows([(idx, data)], outcome)
+                else:
+                    self._assign_clip([(idx, data)], outcome, results)
+        else:
+            # Split the cores between the encoders instead of letting every
+            # libx264 process grab all of them.
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {}
+                reused = []
+                # Row hash -> rows sharing its clip; later identical rows join
+                # the list and are settled with it once the clip is done.
+                groups = {}
+                for key, idx, data in self._keyed_rows():
+                    if key in groups:
+                        groups[key].append((idx, data))
+                        continue
+                    rows = [(idx, data)]
+                    if key is not None:
+                        groups[key] = rows
+                    reusable = self._reusable_clip(data)
+                    if reusable is not None:
+                        reused.append((rows, reusable))
+                        continue
+                    future = executor.submit(self._create_video_in_worker, idx, data, None, threads,
+                                             None, self._row_duration(idx),
+                                             idx in self._produced["audio"])
+                    futures[future] = rows
+                for rows, reusable in reused:
+                    self._assign_clip(rows, reusable, results)
+                for done, future in enumerate(as_completed(futures), start=1):
+                    rows = futures[future]
+                    try:
+                        video_file_path, cache_stats, events = future.result()
+                        self.profiler.merge(events)
+                        self._assign_clip(rows, video_file_path, results)
+                        if self.tts_cache:
+                            self.tts_cache.hits += cache_stats["hits"]
+                            self.tts_cache.misses += cache_stats["misses"]
+                            self.tts_cache.evictions += cache_stats["evictions"]
+                        print(f"Rendered clip {done}/{len(futures)}")
+                    except Exception as e:
+                        self._fail_rows(rows, e)
 
-    def create_audio(self):
+        for idx, error in sorted(self.failed_rows.items()):
+            print(f"Warning: row {idx+1} failed: {error}")
+
+        if self.manifest is not None:
+            self.manifest.save()
+        return [results[idx] for idx in sorted(results)]
+
+    def _keyed_rows(self):
+        """``(key, idx, data)`` for each row, pulled from ``data_list`` only when needed.
+
+        With a manifest, identical rows share one clip path, so ``key`` is the
+        row hash and rows with the same key are rendered once; otherwise it
+        is None.
+        """
         for idx, data in enumerate(self.data_list):
-            text_to_speak = "\n".join(data)
-            tts = gTTS(text=text_to_speak, lang='gu')
-            audio_file_path = f"Gyan_Dariyo_audio_{idx+1}.mp3"
-            tts.save(audio_file_path)
+            yield (self.row_hash(data) if self.manifest is not None else None), idx, data
+
+    def _row_duration(self, idx):
+        return self._durations.get(self.audio_path(idx))
+
+    def _assign_clip(self, rows, video_file_path, results):
+        for idx, data in rows:
+            results[idx] = video_file_path
+            self._produced["clips"].add(idx)
+            self._record_clip(idx, data, video_file_path)
+
+    def _fail_rows(self, rows, error):
+        for idx, _ in rows:
+            self.failed_rows[idx] = f"{type(error).__name__}: {error}"
+
+    def _record_clip(self, idx, data, video_file_path):
+        if self.manifest is not None:
+            self.manifest.record(idx, self.row_hash(data), video_file_path)
+        if self.checkpoint is not None:
+            self.checkpoint.record(idx, self.row_hash(data), video_file_path)
+
+    def create_final_video(self, video_list, method="auto"):
+        """Join the per-row clips into ``output_path`` (``Gyan_Dariyo_final_video.mp4`` by default).
+
+        ``method="auto"`` stream-copies the clips through the ffmpeg concat
+        demuxer when they share codec, resolution and fps, and otherwise
+        re-encodes each clip to common parameters before joining them that
+        way. ``"copy"`` and ``"reencode"`` force one path. Both read the clips
+        one at a time, so memory stays flat however many rows there are;
+        ``self.finalize_result`` records the method used and the step's peak RSS.
+        The video is written in the scratch directory and moved into place
+        when complete.
+        """
+        start = time.perf_counter()
+        with self.profiler.stage("concat") as event, StepPeakRSS() as rss:
+            final_path, used = self._concat(video_list, method, rss.add_child)
+            event["bytes_written"] = os.path.getsize(final_path)
+        self.finalize_result = FinalizeResult(final_path, used, len(video_list),
+                                              time.perf_counter() - start, rss.bytes)
+        return final_path
 
-    def create_videos(self):
-        video_list = []
+    def _concat(self, video_list, method, on_rusage=None):
+        final_video_file_path = os.path.join(self.work_dir, "Gyan_Dariyo_final_video.mp4")
+
+        if method == "copy" or (method == "auto" and can_stream_copy(video_list)):
+            try:
+                concat_stream_copy(video_list, final_video_file_path, on_rusage)
+                return promote_file(final_video_file_path, self.output_path), "copy"
+            except subprocess.CalledProcessError as e:
+                if method == "copy":
+                    raise
+                error = e.stderr.decode("utf-8", errors="replace").strip()
+                print(f"Warning: stream copy failed, re-encoding instead: {error}")
+        elif method == "auto":
+            print("Clip parameters differ, re-encoding final video")
+
+        fps = self.still_fps if self.encode_mode == "still" else self.default_fps
+        concat_reencode(video_list, final_video_file_path, self.image_width, self.image_height, fps,
+                        on_rusage=on_rusage)
+        return promote_file(final_video_file_path, self.output_path), "reencode"
+
+    def create_session_video(self):
+        """Encode every row straight into ``output_path`` with a single ffmpeg process.
+
+        Each row's speech is appended to one WAV, then its slide is held for
+        exactly that audio's length in one encoder session, so no per-row
+        clips are written and codec start-up is paid once. Rows become
+        chapters of the MP4; the marks are kept in ``self.chapters`` and
+        written next to the video as ``<name>.chapters.json``.
+        """
+        self.failed_rows = {}
+        rows = []
         for idx, data in enumerate(self.data_list):
-            text_to_speak = "\n".join(data)
-            tts = gTTS(text=text_to_speak, lang='gu')
-            audio_file_path = f"Gyan_Dariyo_audio_{idx+1}.mp3"
-            tts.save(audio_file_path)
+            try:
+                rows.append((idx, data, self._ensure_audio(idx, data)))
+            except Exception as e:
+                self.failed_rows[idx] = f"{type(e).__name__}: {e}"
+        for idx, error in sorted(self.failed_rows.items()):
+            print(f"Warning: row {idx+1} failed: {error}")
+        if not rows:
+            raise RuntimeError("No rows available for the final video")
+
+        sample_rate = 44100
+        audio_path = os.path.join(self.work_dir, "Gyan_Dariyo_session_audio.wav")
+        with self.profiler.stage("audio_concat") as event:
+            counts = concatenate_wav([path for _, _, path in rows], audio_path, sample_rate)
+            event["bytes_written"] = os.path.getsize(audio_path)
+
+        # Boundaries come from sample counts, so chapters and slide changes
+        # line up with the audio exactly.
+        self.chapters = []
+        end = 0
+        for (idx, data, _), count in zip(rows, counts, strict=True):
+            start, end = end, end + count
+            self.chapters.append({"row": idx, "start": start / sample_rate,
+                                  "end": end / sample_rate, "title": data[0]})
+        metadata_path = write_ffmetadata(self.chapters, os.path.join(self.work_dir, "chapters.txt"))
 
-            audio_clip = AudioFileClip(audio_file_path)
-            audio_duration = audio_clip.duration
+        final_video_file_path = os.path.join(self.work_dir, "Gyan_Dariyo_final_video.mp4")
+        with self.profiler.stage("encode") as event:
+            with StillSequenceEncoder(final_video_file_path, self.image_width, self.image_height,
+                                      audio_path, fps=self.still_fps, metadata_path=metadata_path,
+                                      sample_rate=sample_rate, pix_fmt=FrameBufferPool.pix_fmt) as encoder:
+                for (idx, data, _), chapter in zip(rows, self.chapters, strict=True):
+                    with self.profiler.stage("row", row=idx), self._rendered(data) as (frame, _):
+                        encoder.hold(frame, chapter["end"])
+            event["bytes_written"] = os.path.getsize(final_video_file_path)
 
-            image_path = f"Gyan_Dariyo_image_{idx+1}.png"
-            image_clip = ImageClip(image_path)
-            video_clip = image_clip.set_audio(audio_clip).set_duration(audio_duration).set_fps(self.default_fps)
+        output_path = promote_file(final_video_file_path, self.output_path)
+        write_json_atomic(f"{os.path.splitext(output_path)[0]}.chapters.json", {"chapters": self.chapters})
+        return output_path
 
-            video_file_path = f"Gyan_Dariyo_video_{idx+1}.mp4"
-            video_list.append(video_file_path)
-            video_clip.write_videofile(video_file_path, codec="libx264", audio_codec="aac")
+    def run(self, stages=PIPELINE_STAGES, workers=None):
+        """Run the pipeline stages in order, each consuming the previous stage's files.
 
-        return video_list
+        Rows whose stage output was already produced (by this instance, or by
+        an earlier run when ``reuse_existing`` is set) and is still newer than
+        its inputs are skipped, so audio is synthesized once per row.
+        Returns ``{"clips": [...], "final": path}`` for the stages that ran.
+        """
+        unknown = set(stages) - set(PIPELINE_STAGES)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stage(s): {', '.join(sorted(unknown))}")
 
-    def create_final_video(self, video_list):
-        video_clips = [VideoFileClip(video) for video in video_list]
-        final_video = concatenate_videoclips(video_clips)
-        final_video_file_path = "Gyan_Dariyo_final_video.mp4"
-        final_video.write_videofile(final_video_file_path, codec="libx264", audio_codec="aac")
-        return final_video_file_path
+        artifacts = {}
+        for stage in PIPELINE_STAGES:
+            if stage not in stages:
+                continue
+            print(f"Stage: {stage}")
+            if stage == "images":
+                self.create_images()
+            elif stage == "audio":
+                self.create_audio()
+            elif stage == "clips":
+                if self.encode_mode == "session":
+                    # The session encoder renders rows during the final stage.
+                    continue
+                artifacts["clips"] = self.create_videos(workers)
+            elif stage == "final" and self.encode_mode == "session":
+                artifacts["final"] = self.create_session_video()
+                if self.manifest is not None:
+                    self.manifest.save(final=artifacts["final"])
+            elif stage == "final":
+                video_list = artifacts.get("clips")
+                if video_list is None and self.manifest is not None:
+                    video_list = self.manifest.clips()
+                elif video_list is None:
+                    video_list = [self.video_path(idx) for idx in range(len(self.data_list))
+                                  if _is_valid(self.video_path(idx))]
+                if not video_list:
+                    raise RuntimeError("No clips available for the final video")
+                artifacts["final"] = self.create_final_video(video_list)
+                if self.manifest is not None:
+                    # Drop clips of rows that were edited or removed.
+                    self.manifest.prune()
+                    self.manifest.save(final=artifacts["final"])
+        return artifacts
@@ -5,11 +5,22 @@ This script processes CSV files and creates educational videos using the csv_to_
 """
 
 import pandas as pd
+import hashlib
 import os
 import sys
 import argparse
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from csv_to_video_generator.video_creator import GyanDariyoVideoCreator
+from csv_to_video_generator.video_creator import PIPELINE_STAGES, GyanDariyoVideoCreator
+from csv_to_video_generator.tts import BACKENDS, get_backend
+from csv_to_video_generator.tts_cache import TTSCache
+from csv_to_video_generator.manifest import BuildManifest
+from csv_to_video_generator.checkpoint import CheckpointJournal, file_digest
+from csv_to_video_generator.ffmpeg_tools import probe_durations
+from csv_to_video_generator.fsutil import write_json_atomic
+from csv_to_video_generator.instrumentation import NULL_PROFILER, Profiler
 import shutil
 
 def find_csv_files(directory="."):
@@ -24,30 +35,72 @@ def find_csv_files(directory="."):
                 csv_files.append(os.path.join(root, file))
     return csv_files
 
+def output_names(csv_files):
+    """
+    Base name of each CSV's outputs (video, manifest, clips, checkpoint): its file
+    stem, plus a digest of its path when another CSV in the batch has the same stem,
+    so CSVs from different directories never share output files.
+    """
+    stems = Counter(Path(csv_file).stem for csv_file in csv_files)
+    names = {}
+    for csv_file in csv_files:
+        stem = Path(csv_file).stem
+        if stems[stem] > 1:
+            digest = hashlib.sha1(os.path.relpath(csv_file).encode("utf-8")).hexdigest()[:8]
+            stem = f"{stem}_{digest}"
+        names[csv_file] = stem
+    return names
+
+# (column, prefix) pairs in the order GyanDariyoVideoCreator expects them
+CSV_COLUMNS = [
+    ('question', ''),
+    ('option_a', 'A. '),
+    ('option_b', 'B. '),
+    ('option_c', 'C. '),
+    ('option_d', 'D. '),
+    ('answer', 'Answer: '),
+    ('additional_info', ''),
+]
+
+def iter_csv_rows(csv_path, chunksize=1000, columns=CSV_COLUMNS, profiler=NULL_PROFILER):
+    """
+    Stream a CSV file as GyanDariyoVideoCreator rows, one chunk at a time.
+    The column mapping is resolved once from the header; empty cells are dropped
+    and rows with no content at all are skipped.
+    """
+    print(f"Reading CSV file: {csv_path}")
+    reader = pd.read_csv(csv_path, chunksize=chunksize, dtype=str, keep_default_na=False)
+
+    mapping = None
+    while True:
+        with profiler.stage("csv_parse"):
+            chunk = next(reader, None)
+        if chunk is None:
+            break
+        if mapping is None:
+            positions = {name: i for i, name in enumerate(chunk.columns)}
+            mapping = [(positions[name], prefix) for name, prefix in columns if name in positions]
+            if 'question' not in positions:
+                print(f"Warning: {csv_path} has no 'question' column")
+
+        for values in chunk.itertuples(index=False, name=None):
+            data_entry = [f"{prefix}{values[i].strip()}" for i, prefix in mapping if values[i].strip()]
+            if data_entry:
+                yield data_entry
+
 def read_csv_data(csv_path):
     """
     Read CSV file and convert to format required by GyanDariyoVideoCreator
     Expected CSV columns: question, option_a, option_b, option_c, option_d, answer, additional_info (optional)
     """
-    print(f"Reading CSV file: {csv_path}")
-    df = pd.read_csv(csv_path)
-
-    data_list = []
-    for _, row in df.iterrows():
-        data_entry = [
-            str(row.get('question', '')),
-            f"A. {row.get('option_a', '')}" if 'option_a' in row else '',
-            f"B. {row.get('option_b', '')}" if 'option_b' in row else '',
-            f"C. {row.get('option_c', '')}" if 'option_c' in row else '',
-            f"D. {row.get('option_d', '')}" if 'option_d' in row else '',
-            f"Answer: {row.get('answer', '')}" if 'answer' in row else '',
-            str(row.get('additional_info', ''))
-        ]
-        # Filter out empty strings
-        data_entry = [item for item in data_entry if item and item not in ['A. ', 'B. ', 'C. ', 'D. ', 'Answer: ']]
-        data_list.append(data_entry)
-
-    return data_list
+    return list(iter_csv_rows(csv_path))
+
+def _copy_font(src, font_name):
+    # Copy under a temporary name first: parallel jobs may set up the font at the same time
+    fd, tmp_path = tempfile.mkstemp(dir=".", prefix=f".{font_name}.")
+    os.close(fd)
+    shutil.copy(src, tmp_path)
+    os.replace(tmp_path, font_name)
 
 def setup_font():
     """Copy font file to working directory if not present"""
@@ -60,7 +113,7 @@ def setup_font():
         roboto_font = fonts_dir / "Roboto-Medium.ttf"
         if roboto_font.exists():
             print(f"Using Roboto font: {roboto_font}")
-            shutil.copy(roboto_font, font_name)
+            _copy_font(roboto_font, font_name)
             return True
         else:
             # Try system fonts as fallback
@@ -73,92 +126,337 @@ def setup_font():
             for sys_font in system_fonts:
                 if Path(sys_font).exists():
                     print(f"Using system font: {sys_font}")
-                    shutil.copy(sys_font, font_name)
+                    _copy_font(sys_font, font_name)
                     return True
 
             print(f"Warning: No suitable font found. Using PIL default font.")
             return False
     return True
 
-def generate_videos_from_csv(csv_path, output_dir="output"):
-    """Generate videos from a CSV file"""
+def generate_videos_from_csv(csv_path, output_dir="output", workers=1, tts_cache=None, tts_backend=None,
+                             tts_concurrency=1, tts_rate=None, incremental=True, scratch_dir=None,
+                             profile=False, trace=False, resume=False, encode_mode="still", glyph_atlas=False,
+                             name=None):
+    """Generate videos from a CSV file; outputs are named after name (default: the CSV's stem)"""
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
 
-    # Read CSV data
-    data_list = read_csv_data(csv_path)
-
-    if not data_list:
-        print(f"No data found in {csv_path}")
-        return None
-
-    print(f"Processing {len(data_list)} entries from {csv_path}")
+    # The manifest and per-row clips live next to the output, so a rerun only
+    # renders rows whose text or render settings changed
+    csv_filename = name or Path(csv_path).stem
+    manifest = BuildManifest(os.path.join(output_dir, f"{csv_filename}.manifest.json"),
+                             clip_dir=os.path.join(output_dir, f"{csv_filename}_clips"))
+    if not incremental:
+        manifest.known.clear()
 
     # Setup font
     setup_font()
 
-    # Create video creator instance
-    video_creator = GyanDariyoVideoCreator(data_list)
-
-    # Create images
-    print("Creating images...")
-    video_creator.create_images()
-
-    # Create audio
-    print("Creating audio...")
-    video_creator.create_audio()
-
-    # Create videos
-    print("Creating videos...")
-    video_list = video_creator.create_videos()
-
-    # Create final video
-    print("Creating final video...")
-    final_video_path = video_creator.create_final_video(video_list)
-
-    # Move final video to output directory with descriptive name
-    csv_filename = Path(csv_path).stem
-    output_filename = f"{csv_filename}_final_video.mp4"
-    output_path = os.path.join(output_dir, output_filename)
-
-    if os.path.exists(final_video_path):
-        shutil.move(final_video_path, output_path)
+    # Per-run timing report ({csv}.profile.json) and Chrome trace ({csv}.trace.json)
+    profiler = Profiler() if profile or trace else NULL_PROFILER
+
+    # Each job renders in its own scratch directory, so several CSV files can be
+    # processed at once; the final video is moved into output_dir only when complete
+    output_path = os.path.join(output_dir, f"{csv_filename}_final_video.mp4")
+
+    # Every finished clip is journaled right away. With resume, an interrupted run
+    # of the same CSV content continues in its scratch directory (reusing the audio
+    # synthesized there) and skips the clips it already rendered
+    checkpoint = CheckpointJournal(os.path.join(output_dir, f"{csv_filename}.checkpoint.jsonl"))
+    csv_digest = file_digest(csv_path)
+    resuming = resume and checkpoint.resumable(csv_digest)
+    if resuming:
+        work_dir = checkpoint.work_dir
+        manifest.known.update(checkpoint.clips())
+        print(f"Resuming {csv_path}: {len(checkpoint.rows)} row(s) already rendered")
+    else:
+        if resume:
+            print(f"No checkpoint to resume for {csv_path}, starting from the beginning")
+        if checkpoint.work_dir and os.path.isdir(checkpoint.work_dir):
+            # The journal is about to be overwritten; drop the scratch files it pointed to.
+            shutil.rmtree(checkpoint.work_dir, ignore_errors=True)
+        work_dir = tempfile.mkdtemp(prefix=f"{csv_filename}_", dir=scratch_dir)
+    checkpoint.start(csv_path, csv_digest, work_dir, keep_rows=resuming)
+
+    completed = False
+    try:
+        # Rows are parsed lazily, so the first clip starts before the whole CSV is read
+        video_creator = GyanDariyoVideoCreator(iter_csv_rows(csv_path, profiler=profiler), workers=workers,
+                                               tts_cache=tts_cache, tts_backend=tts_backend,
+                                               tts_concurrency=tts_concurrency, tts_rate=tts_rate,
+                                               encode_mode=encode_mode, reuse_existing=resuming, manifest=manifest,
+                                               work_dir=work_dir, output_path=output_path,
+                                               profiler=profiler, checkpoint=checkpoint,
+                                               glyph_atlas=glyph_atlas)
+        data_list = video_creator.data_list
+
+        if not data_list:
+            print(f"No data found in {csv_path}")
+            completed = True
+            return None
+
+        print(f"Using font: {video_creator.font_path or 'PIL default'}")
+
+        # Run images -> audio -> clips -> final, each stage reusing the previous one's files.
+        # Serial TTS gains nothing from a separate audio pass, so let each clip fetch its own
+        # audio and keep rendering streaming; still clips then end with their audio instead
+        # of probing it.
+        stages = PIPELINE_STAGES if tts_concurrency > 1 else tuple(s for s in PIPELINE_STAGES if s != "audio")
+        try:
+            artifacts = video_creator.run(stages)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return None
+        finally:
+            print(f"Processed {len(data_list)} entries from {csv_path}")
+            if video_creator.failed_rows:
+                print(f"{len(video_creator.failed_rows)} of {len(data_list)} rows failed and were skipped")
+        completed = os.path.exists(artifacts["final"])
+        result = video_creator.finalize_result
+        if result is not None and result.peak_rss:
+            print(f"Joined {result.clips} clips by {result.method} in {result.seconds:.1f}s "
+                  f"(peak RSS {result.peak_rss / 2**20:.0f} MiB)")
+    finally:
+        if completed:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            checkpoint.remove()
+        else:
+            # Keep the scratch files so --resume can pick up where this run stopped
+            print(f"Run interrupted; {len(checkpoint.rows)} clip(s) checkpointed in {checkpoint.path}. "
+                  f"Rerun with --resume to continue.")
+        if profile:
+            profiler.write_report(os.path.join(output_dir, f"{csv_filename}.profile.json"))
+            for stage, totals in profiler.summary().items():
+                print(f"  {stage:<10} {totals['count']:>6} x  wall {totals['wall']:8.2f}s  cpu {totals['cpu']:8.2f}s")
+        if trace:
+            profiler.write_chrome_trace(os.path.join(output_dir, f"{csv_filename}.trace.json"))
+
+    if completed:
+        manifest.save(final=output_path)
         print(f"Final video saved to: {output_path}")
-
-        # Clean up intermediate files
-        cleanup_intermediate_files()
-
         return output_path
     else:
         print(f"Error: Final video was not created")
         return None
 
-def cleanup_intermediate_files():
-    """Clean up intermediate image, audio, and video files"""
-    patterns = [
-        "Gyan_Dariyo_image_*.png",
-        "Gyan_Dariyo_audio_*.mp3",
-        "Gyan_Dariyo_video_*.mp4"
-    ]
-
-    import glob
-    for pattern in patterns:
-        for file in glob.glob(pattern):
-            try:
-                os.remove(file)
-                print(f"Cleaned up: {file}")
-            except Exception as e:
-                print(f"Warning: Could not remove {file}: {e}")
+def shard_rows(rows, shard_size=None, shard_duration=None, durations=None):
+    """
+    Split rows into consecutive shards of (global row index, row) pairs.
+    With shard_size every shard holds that many rows; with shard_duration rows are
+    added until the next one would push the shard past that many seconds (per-row
+    durations are given in durations, and a shard always holds at least one row).
+    """
+    shards = []
+    current = []
+    current_duration = 0.0
+    for idx, row in enumerate(rows):
+        duration = (durations[idx] or 0.0) if durations is not None else 0.0
+        if current and (
+            (shard_size and len(current) >= shard_size)
+            or (shard_duration and current_duration + duration > shard_duration)
+        ):
+            shards.append(current)
+            current, current_duration = [], 0.0
+        current.append((idx, row))
+        current_duration += duration
+    if current:
+        shards.append(current)
+    return shards
+
+def _link_or_copy(src, dest):
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
+def _render_shard(shard_no, shard, output_dir, csv_filename, workers=1, tts_cache=None, tts_backend=None,
+                  tts_concurrency=1, tts_rate=None, incremental=True, scratch_dir=None, encode_mode="still",
+                  glyph_atlas=False, audio_files=None):
+    """Render one shard into its own video
+
+    Returns its entry for the shard index and what the shard added to the TTS
+    cache counters, which don't reach the parent from this process.
+    """
+    name = f"{csv_filename}_part{shard_no + 1:03d}"
+    before = tts_cache.stats() if tts_cache else {}
+    manifest = BuildManifest(os.path.join(output_dir, f"{name}.manifest.json"),
+                             clip_dir=os.path.join(output_dir, f"{name}_clips"))
+    if not incremental:
+        manifest.known.clear()
+
+    output_path = os.path.join(output_dir, f"{name}.mp4")
+    work_dir = tempfile.mkdtemp(prefix=f"{name}_", dir=scratch_dir)
+    try:
+        video_creator = GyanDariyoVideoCreator([row for _, row in shard], workers=workers,
+                                               tts_cache=tts_cache, tts_backend=tts_backend,
+                                               tts_concurrency=tts_concurrency, tts_rate=tts_rate,
+                                               encode_mode=encode_mode, reuse_existing=bool(audio_files),
+                                               manifest=manifest, work_dir=work_dir,
+                                               output_path=output_path, glyph_atlas=glyph_atlas)
+        # Speech synthesized while planning the shards is handed over instead of requested again
+        for local_idx, src in enumerate(audio_files or []):
+            if src and os.path.exists(src):
+                _link_or_copy(src, video_creator.audio_path(local_idx))
+
+        stages = PIPELINE_STAGES if tts_concurrency > 1 else tuple(s for s in PIPELINE_STAGES if s != "audio")
+        artifacts = video_creator.run(stages)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    manifest.save(final=artifacts["final"])
+    after = tts_cache.stats() if tts_cache else {}
+
+    # Row timestamps inside the shard video: chapter marks of a session encode,
+    # otherwise the running sum of the joined clips' durations
+    if video_creator.chapters:
+        marks = [(c["row"], c["start"], c["end"]) for c in video_creator.chapters]
+    else:
+        done = [i for i in range(len(shard)) if i not in video_creator.failed_rows]
+        marks = []
+        position = 0.0
+        for local_idx, duration in zip(done, probe_durations(artifacts["clips"]), strict=True):
+            marks.append((local_idx, position, position + (duration or 0.0)))
+            position += duration or 0.0
+
+    entry = {
+        "shard": shard_no,
+        "file": os.path.relpath(artifacts["final"], output_dir),
+        "duration": marks[-1][2] if marks else 0.0,
+        "rows": [
+            {"row": shard[local_idx][0], "start": start, "end": end, "question": shard[local_idx][1][0]}
+            for local_idx, start, end in marks
+        ],
+        "failed_rows": sorted(shard[i][0] for i in video_creator.failed_rows),
+    }
+    return entry, {k: after[k] - before[k] for k in after}
+
+def generate_sharded_videos(csv_path, output_dir="output", shard_size=None, shard_duration=None,
+                            shard_jobs=None, workers=1, tts_cache=None, tts_backend=None,
+                            tts_concurrency=1, tts_rate=None, incremental=True, scratch_dir=None,
+                            encode_mode="still", glyph_atlas=False, name=None):
+    """
+    Split a CSV into several videos of shard_size questions or about shard_duration
+    seconds each and render them concurrently. The shard index, mapping every row to
+    its video and timestamps, is written to <output_dir>/<csv>.shards.json, where <csv>
+    is name (default: the CSV's stem).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    csv_filename = name or Path(csv_path).stem
+    setup_font()
+
+    rows = read_csv_data(csv_path)
+    if not rows:
+        print(f"No data found in {csv_path}")
+        return []
+
+    shard_args = {"workers": workers, "tts_cache": tts_cache, "tts_backend": tts_backend,
+                  "tts_concurrency": tts_concurrency, "tts_rate": tts_rate, "incremental": incremental,
+                  "scratch_dir": scratch_dir, "encode_mode": encode_mode, "glyph_atlas": glyph_atlas}
+
+    audio_dir = None
+    try:
+        audio_files = None
+        durations = None
+        if shard_duration:
+            # Durations come from the speech, so synthesize it once up front and hand
+            # each shard its files
+            audio_dir = tempfile.mkdtemp(prefix=f"{csv_filename}_audio_", dir=scratch_dir)
+            planner = GyanDariyoVideoCreator(rows, tts_cache=tts_cache, tts_backend=tts_backend,
+                                             tts_concurrency=tts_concurrency, tts_rate=tts_rate,
+                                             work_dir=audio_dir)
+            planner.create_audio()
+            audio_files = [planner.audio_path(idx) if os.path.exists(planner.audio_path(idx)) else None
+                           for idx in range(len(rows))]
+            probed = iter(probe_durations([path for path in audio_files if path]))
+            durations = [next(probed) if path else None for path in audio_files]
+
+        shards = shard_rows(rows, shard_size, shard_duration, durations)
+        print(f"Rendering {len(rows)} rows from {csv_path} as {len(shards)} shard(s)")
+
+        entries = {}
+        with ProcessPoolExecutor(max_workers=shard_jobs or os.cpu_count() or 1) as executor:
+            futures = {
+                executor.submit(_render_shard, shard_no, shard, output_dir, csv_filename,
+                                audio_files=[audio_files[idx] for idx, _ in shard] if audio_files else None,
+                                **shard_args): shard_no
+                for shard_no, shard in enumerate(shards)
+            }
+            for future in as_completed(futures):
+                shard_no = futures[future]
+                try:
+                    entries[shard_no], cache_stats = future.result()
+                    if tts_cache:
+                        tts_cache.hits += cache_stats["hits"]
+                        tts_cache.misses += cache_stats["misses"]
+                        tts_cache.evictions += cache_stats["evictions"]
+                    print(f"Rendered shard {shard_no + 1}/{len(shards)}: {entries[shard_no]['file']}")
+                except Exception as e:
+                    print(f"Error rendering shard {shard_no + 1} of {csv_path}: {e}")
+    finally:
+        if audio_dir:
+            shutil.rmtree(audio_dir, ignore_errors=True)
+
+    index_path = os.path.join(output_dir, f"{csv_filename}.shards.json")
+    write_json_atomic(index_path, {
+        "source": os.path.abspath(csv_path),
+        "shard_size": shard_size,
+        "shard_duration": shard_duration,
+        "shards": [entries[shard_no] for shard_no in sorted(entries)],
+        "failed_shards": sorted(set(range(len(shards))) - set(entries)),
+    })
+    print(f"Shard index saved to: {index_path}")
+    return [os.path.join(output_dir, entries[shard_no]["file"]) for shard_no in sorted(entries)]
 
 def main():
     parser = argparse.ArgumentParser(description='Generate videos from CSV files')
     parser.add_argument('--csv-file', help='Specific CSV file to process')
     parser.add_argument('--output-dir', default='output', help='Output directory for videos (default: output)')
     parser.add_argument('--all', action='store_true', help='Process all CSV files in the repository')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of processes used to render clips (0 = one per CPU core, default: 1)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of CSV files processed in parallel (default: 1)')
+    parser.add_argument('--scratch-dir',
+                        help='Directory for per-job scratch files (default: system temp directory)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Write per-stage timings to <output-dir>/<csv>.profile.json')
+    parser.add_argument('--trace', action='store_true',
+                        help='Write a Chrome trace (chrome://tracing) to <output-dir>/<csv>.trace.json')
+    parser.add_argument('--encode-mode', choices=['still', 'moviepy', 'session'], default='still',
+                        help='still: one clip per row joined at the end (default); moviepy: per-row clips '
+                             'rendered by moviepy; session: every row streamed through one encoder into '
+                             'the final video, with per-row chapters')
+    parser.add_argument('--glyph-atlas', action='store_true',
+                        help='Draw slide text from cached word bitmaps instead of rasterizing it every time')
+    parser.add_argument('--shard-size', type=int,
+                        help='Split each CSV into videos of this many questions, rendered in parallel')
+    parser.add_argument('--shard-duration', type=float,
+                        help='Split each CSV into videos of at most about this many seconds, rendered in parallel')
+    parser.add_argument('--shard-jobs', type=int, default=0,
+                        help='Shards rendered at once (0 = one per CPU core, default: 0)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted run from its checkpoint (<output-dir>/<csv>.checkpoint.jsonl)')
+    parser.add_argument('--full-rebuild', action='store_true',
+                        help='Re-render every row instead of reusing clips recorded in the build manifest')
+    parser.add_argument('--tts-cache-dir', help='Directory of the persistent TTS cache (default: ~/.cache/csv_to_video_generator/tts)')
+    parser.add_argument('--tts-backend', choices=sorted(BACKENDS), default='gtts',
+                        help='Speech engine: gtts (network), offline (espeak-ng/pyttsx3), stub (silent, for tests) or http (--tts-url)')
+    parser.add_argument('--tts-url', help='Service URL for --tts-backend http')
+    parser.add_argument('--tts-concurrency', type=int, default=1,
+                        help='Speech requests kept in flight at once (default: 1)')
+    parser.add_argument('--tts-rate', type=float,
+                        help='Maximum speech requests started per second (default: unlimited)')
+    parser.add_argument('--no-tts-cache', action='store_true', help='Synthesize every utterance without the TTS cache')
 
     args = parser.parse_args()
+    if args.shard_size and args.shard_duration:
+        parser.error('--shard-size and --shard-duration are mutually exclusive')
 
     output_dir = args.output_dir
+    tts_cache = False if args.no_tts_cache else TTSCache(args.tts_cache_dir)
+    if args.tts_backend == 'http':
+        tts_backend = get_backend('http', url=args.tts_url)
+    else:
+        tts_backend = get_backend(args.tts_backend)
     csv_files = []
 
     if args.csv_file:
@@ -182,22 +480,58 @@ def main():
             sys.exit(0)
 
     print(f"Found {len(csv_files)} CSV file(s) to process")
+    names = output_names(csv_files)
+
+    job_args = {"workers": args.workers, "tts_cache": tts_cache, "tts_backend": tts_backend,
+                "tts_concurrency": args.tts_concurrency, "tts_rate": args.tts_rate,
+                "incremental": not args.full_rebuild, "scratch_dir": args.scratch_dir,
+                "profile": args.profile, "trace": args.trace, "resume": args.resume,
+                "encode_mode": args.encode_mode, "glyph_atlas": args.glyph_atlas}
 
-    # Process each CSV file
+    # Process each CSV file, one after another or across a pool of job processes
     generated_videos = []
-    for csv_file in csv_files:
-        try:
-            video_path = generate_videos_from_csv(csv_file, output_dir)
-            if video_path:
-                generated_videos.append(video_path)
-        except Exception as e:
-            print(f"Error processing {csv_file}: {e}")
-            import traceback
-            traceback.print_exc()
-            continue
+    if args.shard_size or args.shard_duration:
+        # Shards of one CSV already run in parallel, so the CSV files are taken in turn
+        for csv_file in csv_files:
+            try:
+                generated_videos.extend(generate_sharded_videos(
+                    csv_file, output_dir, shard_size=args.shard_size, shard_duration=args.shard_duration,
+                    shard_jobs=args.shard_jobs, workers=args.workers, tts_cache=tts_cache,
+                    tts_backend=tts_backend, tts_concurrency=args.tts_concurrency, tts_rate=args.tts_rate,
+                    incremental=not args.full_rebuild, scratch_dir=args.scratch_dir,
+                    encode_mode=args.encode_mode, glyph_atlas=args.glyph_atlas, name=names[csv_file]))
+            except Exception as e:
+                print(f"Error processing {csv_file}: {e}")
+    elif args.jobs > 1 and len(csv_files) > 1:
+        setup_font()
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            futures = [executor.submit(generate_videos_from_csv, csv_file, output_dir, name=names[csv_file],
+                                       **job_args)
+                       for csv_file in csv_files]
+            for csv_file, future in zip(csv_files, futures, strict=True):
+                try:
+                    video_path = future.result()
+                    if video_path:
+                        generated_videos.append(video_path)
+                except Exception as e:
+                    print(f"Error processing {csv_file}: {e}")
+    else:
+        for csv_file in csv_files:
+            try:
+                video_path = generate_videos_from_csv(csv_file, output_dir, name=names[csv_file], **job_args)
+                if video_path:
+                    generated_videos.append(video_path)
+            except Exception as e:
+                print(f"Error processing {csv_file}: {e}")
+                import traceback
+                traceback.print_exc()
+                continue
 
     print(f"\n{'='*60}")
     print(f"Video generation complete!")
+    # CSV jobs run in other processes, whose counters are lost; shards report theirs
+    if tts_cache and (args.jobs <= 1 or args.shard_size or args.shard_duration):
+        print(f"TTS cache: {tts_cache.hits} hit(s), {tts_cache.misses} miss(es)")
     print(f"Generated {len(generated_videos)} video(s):")
     for video in generated_videos:
         print(f"  - {video}")
@@ -1,18 +1,26 @@
 import os
 import textwrap
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageFont
 from moviepy.editor import *
 import numpy as np
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 from enum import Enum, auto
-from gtts import gTTS
 import logging
 from pathlib import Path
 import tempfile
 import shutil
 from functools import lru_cache
 
+from csv_to_video_generator.audio import AudioTrack
+from csv_to_video_generator.compositor import FrameCompositor, TextLayer, render_text_layer
+from csv_to_video_generator.fonts import get_font
+from csv_to_video_generator.glyph_atlas import glyph_atlas
+from csv_to_video_generator.timeline import Timeline
+from csv_to_video_generator.tts import GTTSBackend, TTSBackend
+from csv_to_video_generator.tts_cache import TTSCache
+from csv_to_video_generator.tts_scheduler import AsyncTTSScheduler
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -44,6 +52,8 @@ class VideoConfig:
     # Add smooth transition parameters
     transition_duration: float = 0.5
     hold_frame_duration: float = 0.2
+    # Blit text from cached word bitmaps instead of drawing it with PIL
+    glyph_atlas: bool = False
 
 @dataclass
 class AudioConfig:
@@ -56,9 +66,19 @@ class AudioConfig:
     bitrate: str = '192k'
 
 class VideoGenerator:
-    def __init__(self, video_config: VideoConfig, audio_config: AudioConfig):
+    def __init__(self, video_config: VideoConfig, audio_config: AudioConfig,
+                 tts_cache: Optional[TTSCache] = None,
+                 tts_backend: Optional[TTSBackend] = None,
+                 tts_scheduler: Optional[AsyncTTSScheduler] = None):
         self.video_config = video_config
         self.audio_config = audio_config
+        self.tts_cache = tts_cache if tts_cache is not None else TTSCache()
+        self.tts_backend = tts_backend or GTTSBackend()
+        self.tts_scheduler = tts_scheduler or AsyncTTSScheduler(
+            self.tts_backend, self.tts_cache,
+            lang=self.audio_config.language, tld=self.audio_config.tld)
+        self.compositor = FrameCompositor(video_config.width, video_config.height,
+                                          video_config.background_color)
         self.temp_dir = Path(tempfile.mkdtemp())
         
     def cleanup(self):
@@ -67,88 +87,56 @@ class VideoGenerator:
             shutil.rmtree(self.temp_dir)
 
     def _get_font(self, size: int) -> ImageFont.FreeTypeFont:
-        """Get font with fallback options"""
-        for font_path in self.video_config.font_paths:
-            try:
-                return ImageFont.truetype(font_path, size)
-            except OSError:
-                continue
-        return ImageFont.load_default()
+        """Get font with fallback options, loaded once per process"""
+        return get_font(size, self.video_config.font_paths)
+
+    def _content_layers(self, question: str, options: List[str],
+                        answer: str = "", explanation: str = "") -> List[Optional[TextLayer]]:
+        """Render the question, options, answer and explanation blocks once as masks"""
+        width, height = self.video_config.width, self.video_config.height
+        margin = int(width * 0.1)
+        max_width = width - (2 * margin)
+        atlas = glyph_atlas if self.video_config.glyph_atlas else None
+
+        question_layer, _ = render_text_layer(
+            [question], self._get_font(self.video_config.font_size_title),
+            int(height * 0.15), width, max_width, atlas=atlas)
+        options_layer, _ = render_text_layer(
+            options, self._get_font(self.video_config.font_size_options),
+            int(height * 0.35), width, max_width, paragraph_gap=20, atlas=atlas)
+        answer_layer, _ = render_text_layer(
+            [f"Answer: {answer}"] if answer else [],
+            self._get_font(self.video_config.font_size_answer),
+            int(height * 0.65), width, max_width, atlas=atlas)
+        explanation_layer, _ = render_text_layer(
+            [explanation] if explanation else [],
+            self._get_font(self.video_config.font_size_explanation),
+            int(height * 0.75), width, max_width, atlas=atlas)
+        return [question_layer, options_layer, answer_layer, explanation_layer]
 
     def create_frame(self, question: str, options: List[str], 
                     answer: str = "", explanation: str = "", 
-                    show_answer: bool = False) -> np.ndarray:
-        """Create a single frame with all content"""
-        img = Image.new('RGB', (self.video_config.width, self.video_config.height), 
-                       self.video_config.background_color)
-        draw = ImageDraw.Draw(img)
-        
-        # Layout configuration
-        margin = int(self.video_config.width * 0.1)
-        max_width = self.video_config.width - (2 * margin)
-        y_pos = int(self.video_config.height * 0.15)
-
-        # Render question
-        question_font = self._get_font(self.video_config.font_size_title)
-        y_pos = self._render_text_block(draw, question, y_pos, 
-                                      question_font, max_width)
-
-        # Render options with spacing
-        if options:
-            y_pos = int(self.video_config.height * 0.35)
-            options_font = self._get_font(self.video_config.font_size_options)
-            for option in options:
-                y_pos = self._render_text_block(draw, option, y_pos, 
-                                              options_font, max_width) + 20
-
-        # Render answer and explanation if needed
-        if show_answer:
-            if answer:
-                y_pos = int(self.video_config.height * 0.65)
-                answer_font = self._get_font(self.video_config.font_size_answer)
-                y_pos = self._render_text_block(draw, f"Answer: {answer}", 
-                                              y_pos, answer_font, max_width)
-
-            if explanation:
-                y_pos = int(self.video_config.height * 0.75)
-                explanation_font = self._get_font(self.video_config.font_size_explanation)
-                self._render_text_block(draw, explanation, y_pos, 
-                                      explanation_font, max_width)
-
-        return np.array(img)
-
-    def _render_text_block(self, draw: ImageDraw.Draw, text: str, 
-                          y_pos: int, font: ImageFont.FreeTypeFont, 
-                          max_width: int) -> int:
-        """Render text block with improved layout and anti-aliasing"""
-        words = text.split()
-        lines = []
-        current_line = []
-        
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            bbox = font.getbbox(test_line)
-            if bbox[2] <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
-        
-        if current_line:
-            lines.append(' '.join(current_line))
-
-        for line in lines:
-            bbox = font.getbbox(line)
-            line_width = bbox[2] - bbox[0]
-            x_pos = (self.video_config.width - line_width) // 2
-            
-            # Draw text with anti-aliasing
-            draw.text((x_pos, y_pos), line, 
-                     font=font, fill=self.video_config.text_color)
-            y_pos += bbox[3] - bbox[1] + 10
-
-        return y_pos
+                    show_answer: bool = False,
+                    out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Create a single frame with all content, reusing ``out`` as the buffer if given"""
+        layers = self._content_layers(question, options,
+                                      answer if show_answer else "",
+                                      explanation if show_answer else "")
+        return self.compositor.compose(layers, self.video_config.text_color, out=out)
+
+    def create_phase_frames(self, question: str, options: List[str],
+                            answer: str, explanation: str) -> List[np.ndarray]:
+        """Frames revealing question, options, answer and explanation in turn.
+
+        Each block is rendered once and every phase is the previous frame
+        with one more layer composited on top.
+        """
+        frames = []
+        frame = self.compositor.blank()
+        for layer in self._content_layers(question, options, answer, explanation):
+            frame = self.compositor.composite(frame.copy(), layer, self.video_config.text_color)
+            frames.append(frame)
+        return frames
 
     async def generate_video(self, data: List[str]) -> str:
         """Generate video with smooth transitions"""
@@ -156,14 +144,12 @@ class VideoGenerator:
         output_path = str(self.temp_dir / "output.mp4")
         
         try:
-            clips = []
-            current_time = 0.0
+            timeline = Timeline(self.video_config.transition_duration)
+            track = AudioTrack(self.audio_config.sample_rate, self.audio_config.channels)
 
             # Create base frames
-            question_frame = self.create_frame(question, [], "", "")
-            options_frame = self.create_frame(question, options, "", "")
-            answer_frame = self.create_frame(question, options, answer, "", True)
-            final_frame = self.create_frame(question, options, answer, explanation, True)
+            question_frame, options_frame, answer_frame, final_frame = \
+                self.create_phase_frames(question, options, answer, explanation)
 
             # Generate TTS audio for each segment
             segments = [
@@ -173,40 +159,32 @@ class VideoGenerator:
                 (explanation, final_frame)
             ]
 
-            for i, (text, frame) in enumerate(segments):
-                # Generate audio
-                audio_path = str(self.temp_dir / f"audio_{i}.mp3")
-                tts = gTTS(text=text, lang=self.audio_config.language,
-                          tld=self.audio_config.tld)
-                tts.save(audio_path)
-                audio_clip = AudioFileClip(audio_path)
-                
-                # Create video clip with smooth transitions
-                duration = audio_clip.duration + self.video_config.hold_frame_duration
-                video_clip = ImageClip(frame).set_duration(duration)
-                
-                # Apply fade transitions
-                if clips:
-                    video_clip = video_clip.crossfadein(self.video_config.transition_duration)
-                
-                # Combine audio and video
-                final_clip = video_clip.set_audio(audio_clip)
-                final_clip = final_clip.set_start(current_time)
-                clips.append(final_clip)
-                
-                current_time += duration - self.video_config.transition_duration
-
-            # Composite final video
-            final_video = CompositeVideoClip(clips)
-            final_video.write_videofile(
-                output_path,
-                fps=self.video_config.fps,
-                codec='libx264',
-                audio_codec=self.audio_config.codec,
-                audio_bitrate=self.audio_config.bitrate,
-                threads=4,
-                preset='medium'
-            )
+            # Synthesize all segments concurrently so TTS latency overlaps
+            audio_paths = [str(self.temp_dir / f"audio_{i}{self.tts_backend.extension}")
+                           for i in range(len(segments))]
+            await self.tts_scheduler.synthesize_many(
+                zip([text for text, _ in segments], audio_paths, strict=True))
+
+            for (_, frame), audio_path in zip(segments, audio_paths, strict=True):
+                # Decode each narration once; its sample count fixes the slide timing
+                pcm = track.decode(audio_path)
+                duration = len(pcm) / track.sample_rate + self.video_config.hold_frame_duration
+                track.place(pcm, timeline.add(frame, duration))
+
+            audio_path = track.write_wav(self.temp_dir / "narration.wav", timeline.duration)
+            audio_clip = AudioFileClip(audio_path, fps=track.sample_rate)
+            try:
+                timeline.to_clip().set_audio(audio_clip).write_videofile(
+                    output_path,
+                    fps=self.video_config.fps,
+                    codec='libx264',
+                    audio_codec=self.audio_config.codec,
+                    audio_bitrate=self.audio_config.bitrate,
+                    threads=4,
+                    preset='medium'
+                )
+            finally:
+                audio_clip.close()
 
             return output_path
 
@@ -227,6 +205,7 @@ async def main(data_list: List[List[str]]) -> None:
             shutil.move(output_path, final_path)
             logger.info(f"Generated video: {final_path}")
     finally:
+        logger.info(f"TTS cache: {generator.tts_cache.stats()}")
         generator.cleanup()
 
 if __name__ == "__main__":
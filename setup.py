@@ -11,6 +11,7 @@ setup(
         "pandas",
         "Pillow",
         "moviepy",
+        "imageio-ffmpeg",
         "gTTS"
     ],
     entry_points={
@@ -0,0 +1,22 @@
+import numpy as np
+
+from csv_to_video_generator.timeline import Timeline
+
+
+def test_crossfade_midpoint_blends_both_frames():
+    timeline = Timeline(transition=1.0)
+    timeline.add(np.zeros((2, 2, 3), dtype=np.uint8), 2.0)
+    start = timeline.add(np.full((2, 2, 3), 200, dtype=np.uint8), 2.0)
+
+    frame = timeline.frame_at(start + 0.5)
+
+    assert frame.dtype == np.uint8
+    assert np.all(frame == 100)
+
+
+def test_frame_after_transition_is_the_new_still():
+    timeline = Timeline(transition=1.0)
+    timeline.add(np.zeros((2, 2, 3), dtype=np.uint8), 2.0)
+    start = timeline.add(np.full((2, 2, 3), 200, dtype=np.uint8), 2.0)
+
+    assert np.all(timeline.frame_at(start + 1.5) == 200)